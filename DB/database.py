@@ -6,28 +6,113 @@ Module de gestion de la base de données
 - Ajout méthode get_pairs_by_status() pour récupérer les paires par statut
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, text
+from sqlalchemy import create_engine, event, func, case, bindparam, insert, select, update, Column, Index, Integer, String, Float, DateTime
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-from datetime import datetime, timezone
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.exc import OperationalError
+from contextlib import contextmanager, nullcontext
+from collections import OrderedDict
+from typing import Dict, List
 from config import TradingConfig
+import logging
 import threading
+import random
+import time
+import traceback
 import os
 import uuid as uuid_lib
 
+# Logger enfant de 'TradingBot': mêmes handlers (via QueueHandler) que le reste du bot
+logger = logging.getLogger('TradingBot.database')
+
 Base = declarative_base()
 
+# PRAGMAs appliqués à CHAQUE connexion du pool (ils ne sont pas persistants,
+# à l'exception de page_size et journal_mode).
+# page_size doit précéder journal_mode=WAL: il ne prend effet que sur un fichier
+# neuf (avant la création des tables) et est ignoré ensuite.
+SQLITE_PRAGMAS = [
+    "PRAGMA page_size=8192",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA journal_size_limit=67108864",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",
+]
+SQLITE_PRAGMA_SCRIPT = "; ".join(SQLITE_PRAGMAS) + ";"
+
+# Retry: uniquement sur contention SQLite (backoff exponentiel + full jitter)
+MAX_LOCK_RETRIES = 8
+# SQLITE_BUSY, SQLITE_LOCKED
+SQLITE_LOCK_ERRORCODES = (5, 6)
+BACKOFF_BASE_MS = 1
+BACKOFF_CAP_MS = 100
+
+# Taille des lots pour les INSERT multi-lignes (sous la limite de paramètres SQLite)
+BULK_INSERT_CHUNK = 500
+
+# Intervalle (s) entre deux PRAGMA optimize (bot longue durée)
+OPTIMIZE_INTERVAL = 24 * 3600
+
+# Nombre max de paires 'Complete' retournées sans limite explicite
+# (historique sans borne): get_pairs_by_status / iter_pairs_by_status
+COMPLETE_PAIRS_LIMIT = 1000
+
+# Cache des lectures (statistiques, ordres en attente, trades récents):
+# nombre d'entrées et durée de vie max (s). Le TTL couvre les écritures faites
+# par une autre instance Database (bot vs interface web) ou un autre processus.
+READ_CACHE_SIZE = 32
+READ_CACHE_TTL = 1.0
+
+
+def _apply_sqlite_pragmas(dbapi_conn, connection_record):
+    """Listener 'connect': configure chaque nouvelle connexion sqlite3"""
+    cursor = dbapi_conn.cursor()
+    try:
+        # Un seul script (pas de commit: les PRAGMAs ne sont pas transactionnels)
+        cursor.executescript(SQLITE_PRAGMA_SCRIPT)
+    except Exception:
+        # Repli PRAGMA par PRAGMA pour identifier celui qui échoue
+        for pragma in SQLITE_PRAGMAS:
+            try:
+                cursor.execute(pragma)
+            except Exception as e:
+                logger.warning(f"⚠️  Warning pragma {pragma}: {e}")
+    finally:
+        cursor.close()
+
+
+def _begin_transaction(conn):
+    """Listener 'begin': BEGIN IMMEDIATE pour les écritures, BEGIN pour les lectures
+    
+    Le driver est en mode autocommit (isolation_level=None), c'est donc ce
+    listener qui ouvre la transaction. En IMMEDIATE, le verrou d'écriture est
+    pris dès le BEGIN: une contention échoue avant tout travail, pas au milieu.
+    """
+    if conn.get_execution_options().get('begin_immediate'):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    else:
+        conn.exec_driver_sql("BEGIN")
+
 
 class OrderPair(Base):
     """Modèle pour les paires d'ordres achat/vente - NOUVELLE STRUCTURE"""
     __tablename__ = 'order_pairs'
+    __table_args__ = (
+        # Trades récents: filtre status + tri completed_at
+        Index('ix_status_completed', 'status', 'completed_at'),
+    )
     
     # Index auto-incrémenté à chaque ordre d'achat
     index = Column(Integer, primary_key=True, autoincrement=True)
     
     # Status: Buy / Sell / Complete
-    status = Column(String, default='Buy', nullable=False)
+    status = Column(String, default='Buy', nullable=False, index=True)
     
     # Quantité USDC = solde USDC * (*_PERCENT)
     quantity_usdc = Column(Float, nullable=False)
@@ -48,10 +133,10 @@ class OrderPair(Base):
     gain_usdc = Column(Float, nullable=True)
     
     # Buy Order ID = récupéré sur Hyperliquid
-    buy_order_id = Column(String, nullable=True)
+    buy_order_id = Column(String, nullable=True, index=True)
     
     # Sell Order ID = récupéré sur Hyperliquid
-    sell_order_id = Column(String, nullable=True)
+    sell_order_id = Column(String, nullable=True, index=True)
     
     # Offset = afficher sous la forme *_BUY_OFFSET/*_SELL_OFFSET
     offset_display = Column(String, nullable=True)
@@ -59,13 +144,48 @@ class OrderPair(Base):
     # Informations complémentaires
     market_type = Column(String, nullable=True)  # BULL, BEAR, RANGE
     symbol = Column(String, default='BTC')
+    # UUID hexadécimal (32 caractères, sans tirets) - identifiant d'affichage
     uuid = Column(String, unique=True, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # Horodatage UTC posé par SQLite (CURRENT_TIMESTAMP) dans l'INSERT, sans
+    # paramètre lié; server_default couvre les INSERT hors SQLAlchemy
+    created_at = Column(DateTime, default=func.current_timestamp(),
+                        server_default=func.current_timestamp())
     buy_filled_at = Column(DateTime, nullable=True)
     sell_placed_at = Column(DateTime, nullable=True)
-    completed_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True, index=True)
+
+
+# Requêtes fréquentes construites une seule fois (paramètres liés): pas de
+# reconstruction de l'expression à chaque appel, clé de cache de compilation stable
+_SEL_BY_STATUS = select(OrderPair).where(OrderPair.status == bindparam('status'))
+_SEL_BY_BUY_ORDER_ID = select(OrderPair).where(
+    OrderPair.buy_order_id == bindparam('order_id')
+).limit(1)
+_SEL_ACTIVE = select(OrderPair).where(OrderPair.status.in_(['Buy', 'Sell']))
+_SEL_RECENT_TRADES = select(OrderPair).where(
+    OrderPair.status == 'Complete'
+).order_by(OrderPair.completed_at.desc()).limit(bindparam('limit'))
+_UPD_BUY_FILLED = update(OrderPair).where(
+    OrderPair.index == bindparam('pair_index'),
+    OrderPair.status == 'Buy'
+).values(
+    quantity_btc=bindparam('quantity'),
+    status='Sell',
+    buy_filled_at=func.current_timestamp()
+)
+_SEL_STATS_BY_STATUS = select(
+    OrderPair.status,
+    func.count(),
+    func.coalesce(func.sum(OrderPair.gain_usdc), 0),
+    func.coalesce(func.sum(case((OrderPair.gain_usdc > 0, 1), else_=0)), 0)
+).group_by(OrderPair.status)
+
+# created_at/completed_at déjà au format ISO 8601 côté SQLite ('YYYY-MM-DD HH:MM:SS' -> 'T'):
+# ni parsing en datetime ni isoformat() par ligne pour les réponses JSON
+CREATED_AT_ISO = func.replace(OrderPair.created_at, ' ', 'T').label('created_at')
+COMPLETED_AT_ISO = func.replace(OrderPair.completed_at, ' ', 'T').label('completed_at')
 
 
 class Database:
@@ -87,8 +207,24 @@ class Database:
         
         self._engine = None
         self._session_factory = None
-        self._lock = threading.RLock()
+        self._scoped_session = None
+        # Session réutilisée par thread pour les appels safe_execute_*
+        self._thread_sessions = threading.local()
+        # Verrou réservé aux écritures: les lectures passent en parallèle (WAL)
+        self._write_lock = threading.Lock()
         self._initialized = False
+        # Positionné par close(): la base ne peut plus être rouverte
+        self._closed = False
+        # Timer du PRAGMA optimize périodique
+        self._optimize_timer = None
+        
+        # Frais maker précalculés (hors du chemin critique de complete_order_pair)
+        self.refresh_fees()
+        
+        # Cache des lectures: toute écriture incrémente la version et l'invalide
+        self._write_version = 0
+        self._read_cache = OrderedDict()
+        self._read_cache_lock = threading.Lock()
         
         print(f"🗄️  Initialisation base de données: {self.db_file}")
         self._initialize_database()
@@ -110,88 +246,224 @@ class Database:
             self._engine = create_engine(
                 connection_string,
                 echo=False,
-                pool_pre_ping=True,
-                pool_recycle=3600,
                 connect_args={
                     'check_same_thread': False,
-                    'timeout': 30,
+                    'timeout': 5,
                     'isolation_level': None
                 },
-                poolclass=StaticPool
+                poolclass=QueuePool,
+                pool_size=10,
+                max_overflow=20,
+                # LIFO: réutilise la connexion la plus chaude (cache de pages SQLite)
+                pool_use_lifo=True
             )
+            event.listen(self._engine, "connect", _apply_sqlite_pragmas)
+            event.listen(self._engine, "begin", _begin_transaction)
             
             self._session_factory = sessionmaker(
                 bind=self._engine,
-                autoflush=True,
+                autoflush=False,
                 autocommit=False,
                 expire_on_commit=False
             )
+            self._scoped_session = scoped_session(self._session_factory)
             
             Base.metadata.create_all(self._engine)
-            self._optimize_sqlite()
+            self._ensure_indexes()
+            print("✅ Optimisations SQLite appliquées à chaque connexion")
             
             self._initialized = True
+            self._schedule_optimize()
             print("✅ Base de données initialisée avec succès")
             
         except Exception as e:
             print(f"❌ Erreur initialisation base de données: {e}")
-            import traceback
             traceback.print_exc()
             raise
     
-    def _optimize_sqlite(self):
-        """Configure SQLite pour des performances optimales"""
+    def _ensure_indexes(self):
+        """Crée les index manquants sur une base existante (create_all ne le fait pas)"""
+        for index in OrderPair.__table__.indexes:
+            try:
+                index.create(self._engine, checkfirst=True)
+            except Exception as e:
+                print(f"⚠️  Warning index {index.name}: {e}")
+        
+        # Statistiques pour que le planificateur choisisse les nouveaux index
+        # (engine.begin(): le listener ouvre une transaction, il faut la valider)
         try:
-            with self._engine.connect() as conn:
-                optimizations = [
-                    "PRAGMA journal_mode=WAL",
-                    "PRAGMA synchronous=NORMAL",
-                    "PRAGMA cache_size=10000",
-                    "PRAGMA temp_store=MEMORY",
-                    "PRAGMA busy_timeout=30000",
-                ]
-                
-                for pragma in optimizations:
-                    try:
-                        conn.execute(text(pragma))
-                        conn.commit()
-                    except Exception as e:
-                        print(f"⚠️  Warning pragma {pragma}: {e}")
-                
-                print("✅ Optimisations SQLite appliquées")
-                
+            with self._engine.begin() as conn:
+                conn.exec_driver_sql("ANALYZE")
         except Exception as e:
-            print(f"⚠️  Erreur optimisation SQLite: {e}")
+            print(f"⚠️  Warning ANALYZE: {e}")
     
     def get_session(self):
         """Obtient une session de base de données"""
+        self._check_open()
         if not self._initialized:
             self._initialize_database()
         return self._session_factory()
     
-    def safe_execute(self, func, *args, **kwargs):
-        """Exécute une fonction avec gestion d'erreur et retry"""
-        max_retries = 3
-        for attempt in range(max_retries):
+    def on_config_reload(self, config: TradingConfig):
+        """Applique une configuration rechargée et recalcule les frais dérivés"""
+        self.config = config
+        self.refresh_fees()
+    
+    def refresh_fees(self):
+        """Recalcule les multiplicateurs de frais maker depuis self.config
+        
+        À appeler après un rechargement de la configuration (MAKER_FEE).
+        """
+        self._maker_fee_frac = float(self.config.maker_fee) / 100.0
+        self._fee_multiplier_buy = 1 + self._maker_fee_frac
+        self._fee_multiplier_sell = 1 - self._maker_fee_frac
+    
+    def _check_open(self):
+        """Refuse tout accès après close() (sinon le moteur serait rouvert en silence)"""
+        if self._closed:
+            raise RuntimeError(f"Base de données fermée: {self.db_file}")
+    
+    def _thread_session(self):
+        """Session réutilisée par le thread courant (créée au premier appel)
+        
+        Elle est fermée (close) après chaque opération: la connexion retourne au
+        pool et l'identity map est vidée, seul l'objet Session est conservé.
+        """
+        session = getattr(self._thread_sessions, 'session', None)
+        if session is None:
+            session = self._thread_sessions.session = self.get_session()
+        elif session.in_transaction():
+            # Appel imbriqué: la session du thread est déjà utilisée
+            return self.get_session()
+        return session
+    
+    @contextmanager
+    def session_scope(self):
+        """Partage une même session entre plusieurs lectures du thread courant
+        
+        Usage (ex: une requête de l'interface web):
+            with database.session_scope():
+                stats = database.get_statistics()
+                pairs = database.get_all_pairs()
+        
+        Les écritures gardent leur propre session (BEGIN IMMEDIATE + verrou).
+        """
+        if self._scoped_session.registry.has():
+            # Scope déjà ouvert plus haut dans la pile: on le réutilise
+            yield self._scoped_session()
+            return
+        
+        self._check_open()
+        session = self._scoped_session()
+        try:
+            yield session
+        finally:
+            self._scoped_session.remove()
+    
+    def _execute(self, func, lock, *args, **kwargs):
+        """Exécute une fonction avec gestion d'erreur et retry
+        
+        Args:
+            func: Fonction recevant la session en premier argument
+            lock: Verrou à tenir pendant l'exécution (None pour les lectures)
+        """
+        if lock is None and self._scoped_session.registry.has():
+            # Lecture à l'intérieur d'un session_scope(): pas de session dédiée
+            return func(self._scoped_session(), *args, **kwargs)
+        
+        attempt = 0
+        while True:
             session = None
             try:
-                with self._lock:
-                    session = self.get_session()
+                with lock if lock is not None else nullcontext():
+                    session = self._thread_session()
+                    if lock is not None:
+                        session.connection(execution_options={'begin_immediate': True})
                     result = func(session, *args, **kwargs)
                     session.commit()
+                    if lock is not None:
+                        self._write_version += 1
                     return result
             except Exception as e:
                 if session:
                     session.rollback()
-                if attempt < max_retries - 1:
-                    print(f"⚠️  Retry DB (tentative {attempt + 1}): {e}")
-                else:
-                    print(f"❌ Erreur DB après {max_retries} tentatives: {e}")
+                if not self._is_lock_error(e):
+                    # Erreur logique (paire introuvable, contrainte...): rejouer ne sert à rien
+                    raise
+                attempt += 1
+                if attempt >= MAX_LOCK_RETRIES:
+                    logger.error(f"❌ Erreur DB après {MAX_LOCK_RETRIES} tentatives: {e}")
                     raise
+                logger.warning(f"⚠️  Retry DB (tentative {attempt}): {e}")
+                # Full jitter: désynchronise les écrivains en concurrence
+                delay_ms = min(BACKOFF_CAP_MS, BACKOFF_BASE_MS * 2 ** attempt)
+                time.sleep(delay_ms * random.random() / 1000)
             finally:
                 if session:
                     session.close()
     
+    @staticmethod
+    def _is_lock_error(error: Exception) -> bool:
+        """Indique si l'erreur provient d'une contention SQLite (SQLITE_BUSY / SQLITE_LOCKED)"""
+        if not isinstance(error, OperationalError):
+            return False
+        # sqlite_errorcode: Python >= 3.11 (code étendu, le code primaire est l'octet bas)
+        code = getattr(error.orig, 'sqlite_errorcode', None)
+        if code is not None:
+            return code & 0xFF in SQLITE_LOCK_ERRORCODES
+        return 'locked' in str(error).lower()
+    
+    def safe_execute_read(self, func, *args, **kwargs):
+        """Exécute une lecture sans verrou (WAL autorise les lectures concurrentes)"""
+        return self._execute(func, None, *args, **kwargs)
+    
+    def safe_execute_write(self, func, *args, **kwargs):
+        """Exécute une écriture sous verrou (SQLite n'accepte qu'un écrivain)"""
+        return self._execute(func, self._write_lock, *args, **kwargs)
+    
+    def safe_execute(self, func, *args, **kwargs):
+        """Alias pour safe_execute_write() - pour compatibilité avec les anciens scripts"""
+        return self.safe_execute_write(func, *args, **kwargs)
+    
+    def _cached_read(self, key: tuple, loader):
+        """Retourne le résultat de loader() mis en cache sous `key`
+        
+        Une entrée n'est valide que pour la version d'écriture où elle a été
+        lue (toute écriture incrémente _write_version) et READ_CACHE_TTL max.
+        LRU de READ_CACHE_SIZE entrées. Les valeurs sont partagées: les
+        appelants retournent une copie (dict()/list()).
+        """
+        version = self._write_version
+        now = time.monotonic()
+        with self._read_cache_lock:
+            entry = self._read_cache.get(key)
+            if entry is not None and entry[0] == version and now - entry[1] < READ_CACHE_TTL:
+                self._read_cache.move_to_end(key)
+                return entry[2]
+        
+        value = loader()
+        with self._read_cache_lock:
+            self._read_cache[key] = (version, now, value)
+            self._read_cache.move_to_end(key)
+            while len(self._read_cache) > READ_CACHE_SIZE:
+                self._read_cache.popitem(last=False)
+        return value
+    
+    def _buy_pair_row(self, pair_data: dict) -> dict:
+        """Construit les valeurs d'INSERT d'une nouvelle paire (statut 'Buy')"""
+        return {
+            'status': 'Buy',
+            'quantity_usdc': pair_data['quantity_usdc'],
+            'quantity_btc': pair_data['quantity_btc'],
+            'buy_price_btc': pair_data['buy_price_btc'],
+            'sell_price_btc': pair_data['sell_price_btc'],
+            'buy_order_id': pair_data['buy_order_id'],
+            'market_type': pair_data.get('market_type'),
+            'offset_display': pair_data.get('offset_display'),
+            'uuid': uuid_lib.uuid4().hex,
+            'symbol': self.config.symbol
+        }
+    
     def create_buy_order_pair(self, data: dict) -> int:
         """Crée une nouvelle paire d'ordres avec un ordre d'achat
         
@@ -209,32 +481,57 @@ class Database:
             int: Index de la paire créée
         """
         def _create(session, pair_data):
-            new_pair = OrderPair(
-                status='Buy',
-                quantity_usdc=pair_data['quantity_usdc'],
-                quantity_btc=pair_data['quantity_btc'],
-                buy_price_btc=pair_data['buy_price_btc'],
-                sell_price_btc=pair_data['sell_price_btc'],
-                buy_order_id=pair_data['buy_order_id'],
-                market_type=pair_data.get('market_type'),
-                offset_display=pair_data.get('offset_display'),
-                uuid=str(uuid_lib.uuid4()),
-                symbol=self.config.symbol
-            )
-            
-            session.add(new_pair)
-            session.flush()
-            
-            print(f"✅ Paire créée - Index: {new_pair.index}")
-            
-            return new_pair.index
+            # INSERT Core: pas d'instrumentation ORM ni d'unit-of-work
+            return session.execute(
+                insert(OrderPair).values(**self._buy_pair_row(pair_data)).returning(OrderPair.index)
+            ).scalar_one()
         
         try:
-            return self.safe_execute(_create, data)
+            pair_index = self.safe_execute_write(_create, data)
+            logger.debug(f"✅ Paire créée - Index: {pair_index}")
+            return pair_index
         except Exception as e:
-            print(f"❌ Erreur création paire: {e}")
+            logger.error(f"❌ Erreur création paire: {e}")
             raise
     
+    def bulk_create_buy_order_pairs(self, data_list: List[dict]) -> List[int]:
+        """Crée plusieurs paires d'achat en une seule transaction (stratégie grille)
+        
+        Un seul verrou d'écriture, un seul INSERT executemany et un seul commit
+        au lieu de N appels à create_buy_order_pair().
+        
+        Args:
+            data_list: Liste de dicts (même format que create_buy_order_pair)
+        
+        Returns:
+            list: Index des paires créées, dans l'ordre de data_list
+        """
+        if not data_list:
+            return []
+        
+        def _create_all(session, rows):
+            # Lots de BULK_INSERT_CHUNK lignes, dans la même transaction (un seul commit)
+            stmt = insert(OrderPair).returning(OrderPair.index, sort_by_parameter_order=True)
+            indexes = []
+            for start in range(0, len(rows), BULK_INSERT_CHUNK):
+                indexes.extend(
+                    session.execute(stmt, rows[start:start + BULK_INSERT_CHUNK]).scalars().all()
+                )
+            return indexes
+        
+        try:
+            rows = [self._buy_pair_row(pair_data) for pair_data in data_list]
+            indexes = self.safe_execute_write(_create_all, rows)
+            logger.debug(f"✅ {len(indexes)} paires créées - Index: {indexes[0]}..{indexes[-1]}")
+            return indexes
+        except Exception as e:
+            logger.error(f"❌ Erreur création paires en lot: {e}")
+            raise
+    
+    def create_buy_order_pairs_bulk(self, data_list: List[dict]) -> List[int]:
+        """Alias pour bulk_create_buy_order_pairs() - pour les scripts de rattrapage"""
+        return self.bulk_create_buy_order_pairs(data_list)
+    
     # ============================================
     # 🆕 NOUVELLES MÉTHODES POUR GÉRER LES QUANTITÉS RÉELLES
     # ============================================
@@ -253,26 +550,26 @@ class Database:
             bool: True si succès, False sinon
         """
         def _update(session, index, quantity):
-            pair = session.query(OrderPair).filter_by(index=index).first()
+            pair = session.get(OrderPair, index)
             if not pair:
                 raise ValueError(f"Paire {index} introuvable")
             
             old_quantity = pair.quantity_btc
             pair.quantity_btc = quantity
             
-            session.flush()
-            
-            print(f"✅ Quantité BTC mise à jour pour paire {index}")
-            print(f"   Ancienne: {old_quantity:.8f} BTC")
-            print(f"   Nouvelle: {quantity:.8f} BTC")
-            print(f"   Différence: {quantity - old_quantity:.8f} BTC (frais maker)")
-            
-            return True
+            return old_quantity
         
         try:
-            return self.safe_execute(_update, pair_index, new_quantity_btc)
+            old_quantity = self.safe_execute_write(_update, pair_index, new_quantity_btc)
+            logger.debug(
+                f"✅ Quantité BTC mise à jour pour paire {pair_index}\n"
+                f"   Ancienne: {old_quantity:.8f} BTC\n"
+                f"   Nouvelle: {new_quantity_btc:.8f} BTC\n"
+                f"   Différence: {new_quantity_btc - old_quantity:.8f} BTC (frais maker)"
+            )
+            return True
         except Exception as e:
-            print(f"❌ Erreur mise à jour quantité BTC: {e}")
+            logger.error(f"❌ Erreur mise à jour quantité BTC: {e}")
             return False
     
     def update_pair_status(self, pair_index: int, new_status: str) -> bool:
@@ -286,48 +583,89 @@ class Database:
             bool: True si succès, False sinon
         """
         def _update(session, index, status):
-            pair = session.query(OrderPair).filter_by(index=index).first()
-            if not pair:
-                raise ValueError(f"Paire {index} introuvable")
-            
-            old_status = pair.status
-            pair.status = status
-            
-            # Mettre à jour les timestamps selon le statut
-            if status == 'Sell' and not pair.buy_filled_at:
-                pair.buy_filled_at = datetime.now(timezone.utc)
-            elif status == 'Complete' and not pair.completed_at:
-                pair.completed_at = datetime.now(timezone.utc)
-            
-            session.flush()
-            
-            print(f"✅ Statut mis à jour pour paire {index}: {old_status} -> {status}")
+            # UPDATE unique: les timestamps ne sont posés qu'au premier passage
+            values = {'status': status}
+            now = func.current_timestamp()
+            if status == 'Sell':
+                values['buy_filled_at'] = func.coalesce(OrderPair.buy_filled_at, now)
+            elif status == 'Complete':
+                values['completed_at'] = func.coalesce(OrderPair.completed_at, now)
             
+            result = session.execute(
+                update(OrderPair)
+                .where(OrderPair.index == index)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                raise ValueError(f"Paire {index} introuvable")
             return True
         
         try:
-            return self.safe_execute(_update, pair_index, new_status)
+            success = self.safe_execute_write(_update, pair_index, new_status)
+            logger.debug(f"✅ Statut mis à jour pour paire {pair_index}: -> {new_status}")
+            return success
         except Exception as e:
-            print(f"❌ Erreur mise à jour statut: {e}")
+            logger.error(f"❌ Erreur mise à jour statut: {e}")
             return False
     
-    def get_pairs_by_status(self, status: str):
-        """🆕 Récupère toutes les paires ayant un statut donné
+    def get_pairs_by_status(self, status: str, columns=None, limit: int = None):
+        """🆕 Récupère les paires ayant un statut donné ('Complete': plafonnées)
         
         Args:
             status: Statut à filtrer ('Buy', 'Sell', 'Complete')
+            columns: Colonnes à charger (ex: (OrderPair.index, OrderPair.buy_order_id)).
+                     Si fourni, retourne des tuples légers (accès par attribut) au
+                     lieu d'objets OrderPair complets.
+            limit: Nombre max de paires, les plus récentes d'abord. None: toutes
+                   pour 'Buy'/'Sell', les COMPLETE_PAIRS_LIMIT plus récentes pour 'Complete'.
         
         Returns:
             list: Liste des paires
         """
-        def _get(session, pair_status):
-            return session.query(OrderPair).filter_by(status=pair_status).all()
+        pairs = list(self.iter_pairs_by_status(status, limit=limit, columns=columns))
+        if limit is None and status == 'Complete' and len(pairs) >= COMPLETE_PAIRS_LIMIT:
+            logger.warning(
+                f"⚠️  Paires 'Complete' tronquées aux {COMPLETE_PAIRS_LIMIT} plus récentes "
+                f"(passer limit= pour en obtenir davantage)"
+            )
+        return pairs
+    
+    def iter_pairs_by_status(self, status: str, chunk: int = 500, limit: int = None, columns=None):
+        """Itère sur les paires d'un statut par lots de `chunk` lignes
+        
+        limit: nombre max de paires, les plus récentes d'abord. L'historique
+        'Complete' croît sans borne: sans limit explicite, seules les
+        COMPLETE_PAIRS_LIMIT paires les plus récentes sont parcourues.
         
+        Générateur: mêmes précautions que iter_active_order_pairs().
+        """
+        if status == 'Complete' and limit is None:
+            limit = COMPLETE_PAIRS_LIMIT
+        
+        session = self.get_session()
         try:
-            return self.safe_execute(_get, status)
+            if columns:
+                stmt = select(*columns).where(OrderPair.status == bindparam('status'))
+            else:
+                stmt = _SEL_BY_STATUS
+            if limit is not None:
+                # Les plus récentes d'abord (index (status, completed_at) pour 'Complete')
+                order = OrderPair.completed_at if status == 'Complete' else OrderPair.index
+                stmt = stmt.order_by(order.desc()).limit(limit)
+            stmt = stmt.execution_options(yield_per=chunk)
+            
+            result = session.execute(stmt, {'status': status})
+            yield from (result if columns else result.scalars())
         except Exception as e:
-            print(f"❌ Erreur récupération paires par statut: {e}")
-            return []
+            logger.error(f"❌ Erreur récupération paires par statut: {e}")
+        finally:
+            session.close()
+    
+    @staticmethod
+    def _select_pairs(columns=None):
+        """SELECT sur order_pairs: objets OrderPair ou seulement les colonnes demandées"""
+        return select(*columns) if columns else select(OrderPair)
     
     # ============================================
     # MÉTHODES EXISTANTES (inchangées)
@@ -346,10 +684,39 @@ class Database:
             pair_index: Index de la paire
         
         Returns:
-            bool: True si succès
+            bool: True si succès ou fill déjà traité, False si paire introuvable/erreur
         """
-        # Simplement changer le statut à 'Sell'
-        return self.update_pair_status(pair_index, 'Sell')
+        def _update(session, index):
+            # UPDATE unique (pas de SELECT préalable sous le verrou d'écriture).
+            # Garde status='Buy': un double signal de fill ne rétrograde pas
+            # une paire déjà en 'Complete' et ne réécrit pas buy_filled_at.
+            result = session.execute(
+                update(OrderPair)
+                .where(OrderPair.index == index, OrderPair.status == 'Buy')
+                .values(status='Sell', buy_filled_at=func.current_timestamp())
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount:
+                return True
+            
+            # Rien mis à jour: paire absente (erreur) ou fill déjà traité (doublon)
+            exists = session.execute(
+                select(OrderPair.index).where(OrderPair.index == index)
+            ).first()
+            if exists is None:
+                raise ValueError(f"Paire {index} introuvable")
+            return False
+        
+        try:
+            updated = self.safe_execute_write(_update, pair_index)
+            if updated:
+                logger.debug(f"✅ Statut mis à jour pour paire {pair_index}: -> Sell")
+            else:
+                logger.debug(f"⏭️  Paire {pair_index} déjà remplie - fill en double ignoré")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Erreur mise à jour statut: {e}")
+            return False
     
     def update_sell_order_id(self, pair_index: int, sell_order_id: str) -> bool:
         """Met à jour le sell_order_id d'une paire
@@ -362,25 +729,41 @@ class Database:
             bool: True si succès
         """
         def _update(session, index, order_id):
-            pair = session.query(OrderPair).filter_by(index=index).first()
-            if not pair:
+            result = session.execute(
+                update(OrderPair)
+                .where(OrderPair.index == index)
+                .values(sell_order_id=order_id, sell_placed_at=func.current_timestamp())
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
                 raise ValueError(f"Paire {index} introuvable")
-            
-            pair.sell_order_id = order_id
-            pair.sell_placed_at = datetime.now(timezone.utc)
-            
-            session.flush()
-            
-            print(f"✅ sell_order_id mis à jour pour paire {index}: {order_id}")
-            
             return True
         
         try:
-            return self.safe_execute(_update, pair_index, sell_order_id)
+            success = self.safe_execute_write(_update, pair_index, sell_order_id)
+            logger.debug(f"✅ sell_order_id mis à jour pour paire {pair_index}: {sell_order_id}")
+            return success
         except Exception as e:
-            print(f"❌ Erreur mise à jour sell_order_id: {e}")
+            logger.error(f"❌ Erreur mise à jour sell_order_id: {e}")
             return False
 
+    def _gain_expressions(self, sell_price):
+        """Expressions SQL (brut, net, %) du gain d'une paire, évaluées par SQLite dans l'UPDATE
+        
+        Args:
+            sell_price: Prix de vente (valeur ou colonne OrderPair.sell_price_btc)
+        """
+        buy_cost = OrderPair.buy_price_btc * OrderPair.quantity_btc
+        gross_profit = sell_price * OrderPair.quantity_btc - buy_cost
+        
+        # ✅ CORRECTION: Frais MAKER uniquement (pas de taker en spot limit)
+        # Profit net = qty * (vente * (1 - frais) - achat * (1 + frais))
+        net_profit = OrderPair.quantity_btc * (
+            sell_price * self._fee_multiplier_sell - OrderPair.buy_price_btc * self._fee_multiplier_buy
+        )
+        profit_percent = case((buy_cost > 0, net_profit / buy_cost * 100), else_=0)
+        return gross_profit, net_profit, profit_percent
+    
     def complete_order_pair(self, index: int, sell_price_actual: float = None) -> bool:
         """Marque une paire comme complétée et calcule les gains
         
@@ -391,47 +774,48 @@ class Database:
             sell_price_actual: Prix de vente réel (optionnel)
         """
         def _complete(session, pair_index, actual_price):
-            pair = session.query(OrderPair).filter_by(index=pair_index).first()
-            if not pair:
-                return False
-            
             # Prix de vente effectif
-            sell_price = actual_price if actual_price else pair.sell_price_btc
+            sell_price = actual_price if actual_price else OrderPair.sell_price_btc
+            gross_profit, net_profit, profit_percent = self._gain_expressions(sell_price)
             
-            # Calcul du gain brut
-            buy_cost = pair.buy_price_btc * pair.quantity_btc
-            sell_revenue = sell_price * pair.quantity_btc
-            gross_profit = sell_revenue - buy_cost
-            
-            # ✅ CORRECTION: Frais MAKER uniquement (pas de taker en spot limit)
-            maker_fee_percent = self.config.maker_fee / 100
-            buy_fee = buy_cost * maker_fee_percent
-            sell_fee = sell_revenue * maker_fee_percent
-            total_fees = buy_fee + sell_fee
-            
-            # Profit net
-            net_profit = gross_profit - total_fees
-            profit_percent = (net_profit / buy_cost) * 100 if buy_cost > 0 else 0
-            
-            # Mettre à jour la paire
-            pair.gain_usdc = net_profit
-            pair.gain_percent = profit_percent
-            pair.status = 'Complete'
-            pair.completed_at = datetime.now(timezone.utc)
+            # Mettre à jour la paire en un seul UPDATE
+            stmt = (
+                update(OrderPair)
+                .where(OrderPair.index == pair_index)
+                .values(
+                    gain_usdc=net_profit,
+                    gain_percent=profit_percent,
+                    status='Complete',
+                    completed_at=func.current_timestamp()
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if not logger.isEnabledFor(logging.DEBUG):
+                return session.execute(stmt).rowcount > 0
             
-            session.flush()
+            # RETURNING seulement pour le détail des gains en debug
+            return session.execute(
+                stmt.returning(gross_profit, OrderPair.gain_usdc, OrderPair.gain_percent)
+            ).first()
+        
+        try:
+            row = self.safe_execute_write(_complete, index, sell_price_actual)
+            if not row:
+                return False
             
-            print(f"✅ Paire {pair_index} complétée")
-            print(f"   Gain brut: {gross_profit:.2f}$")
-            print(f"   Frais maker: {total_fees:.4f}$")
-            print(f"   Gain net: {net_profit:.2f}$ ({profit_percent:.2f}%)")
+            if row is not True:
+                gross_profit, net_profit, profit_percent = row
+                total_fees = gross_profit - net_profit
+                logger.debug(
+                    f"✅ Paire {index} complétée\n"
+                    f"   Gain brut: {gross_profit:.2f}$\n"
+                    f"   Frais maker: {total_fees:.4f}$\n"
+                    f"   Gain net: {net_profit:.2f}$ ({profit_percent:.2f}%)"
+                )
             
             return True
-        
-        try:
-            return self.safe_execute(_complete, index, sell_price_actual)
         except Exception as e:
-            print(f"❌ Erreur completion paire: {e}")
+            logger.error(f"❌ Erreur completion paire: {e}")
             return False
     
     def complete_pair(self, index: int, sell_price_actual: float = None) -> bool:
@@ -446,64 +830,172 @@ class Database:
         """
         return self.complete_order_pair(index, sell_price_actual)
     
-    def get_pending_buy_orders(self):
+    def update_buy_filled_bulk(self, fills: Dict[int, float]) -> int:
+        """Passe en 'Sell' plusieurs paires dont l'achat est rempli (une transaction)
+        
+        Un seul UPDATE executemany au lieu de update_quantity_btc() +
+        update_pair_status() par paire. Garde status='Buy': un fill déjà
+        traité n'est pas réappliqué.
+        
+        Args:
+            fills: {index de paire: quantité BTC réelle reçue}
+        
+        Returns:
+            int: Nombre de paires mises à jour
+        """
+        if not fills:
+            return 0
+        
+        def _update(session, rows):
+            # executemany Core (pas le mode "bulk ORM" de session.execute)
+            return session.connection().execute(_UPD_BUY_FILLED, rows).rowcount
+        
+        try:
+            rows = [{'pair_index': index, 'quantity': qty} for index, qty in fills.items()]
+            updated = self.safe_execute_write(_update, rows)
+            logger.debug(f"✅ {updated}/{len(rows)} paire(s) passée(s) en Sell")
+            return updated
+        except Exception as e:
+            logger.error(f"❌ Erreur mise à jour achats remplis en lot: {e}")
+            return 0
+    
+    def complete_order_pairs_bulk(self, indexes: List[int]) -> Dict[int, tuple]:
+        """Complète plusieurs paires 'Sell' au prix de vente enregistré (un seul UPDATE)
+        
+        Args:
+            indexes: Index des paires dont la vente est remplie
+        
+        Returns:
+            dict: {index: (gain_usdc, gain_percent)} des paires complétées
+        """
+        if not indexes:
+            return {}
+        
+        def _complete(session, pair_indexes):
+            _, net_profit, profit_percent = self._gain_expressions(OrderPair.sell_price_btc)
+            rows = session.execute(
+                update(OrderPair)
+                .where(OrderPair.index.in_(pair_indexes), OrderPair.status == 'Sell')
+                .values(
+                    gain_usdc=net_profit,
+                    gain_percent=profit_percent,
+                    status='Complete',
+                    completed_at=func.current_timestamp()
+                )
+                .returning(OrderPair.index, OrderPair.gain_usdc, OrderPair.gain_percent)
+                .execution_options(synchronize_session=False)
+            ).all()
+            return {index: (gain, percent) for index, gain, percent in rows}
+        
+        try:
+            completed = self.safe_execute_write(_complete, list(indexes))
+            logger.debug(f"✅ {len(completed)}/{len(indexes)} paire(s) complétée(s)")
+            return completed
+        except Exception as e:
+            logger.error(f"❌ Erreur completion paires en lot: {e}")
+            return {}
+    
+    def get_pending_buy_orders(self, columns=None):
         """Récupère les paires en attente de remplissage d'achat (status='Buy')"""
-        return self.get_pairs_by_status('Buy')
+        return self._get_pending('Buy', columns)
     
-    def get_pending_sell_orders(self):
+    def get_pending_sell_orders(self, columns=None):
         """Récupère les paires prêtes pour la vente (status='Sell')"""
-        return self.get_pairs_by_status('Sell')
+        return self._get_pending('Sell', columns)
     
-    def get_all_pairs(self, limit: int = 100):
-        """Récupère toutes les paires"""
+    def get_pending_pairs(self, columns=None) -> Dict[str, list]:
+        """Paires en attente d'achat ET de vente en une seule requête
+        
+        Args:
+            columns: Colonnes à charger (tuples légers, voir get_pairs_by_status)
+        
+        Returns:
+            dict: {'Buy': [...], 'Sell': [...]}
+        """
+        # Tuple: clé de cache hashable même si l'appelant passe une liste
+        columns = tuple(columns) if columns is not None else None
+        
+        def _get(session):
+            if columns:
+                stmt = select(OrderPair.status, *columns).where(OrderPair.status.in_(['Buy', 'Sell']))
+                rows = session.execute(stmt).all()
+            else:
+                rows = session.scalars(_SEL_ACTIVE).all()
+            
+            pending = {'Buy': [], 'Sell': []}
+            for row in rows:
+                pending[row.status].append(row)
+            return pending
+        
+        try:
+            pending = self._cached_read(('pending_pairs', columns), lambda: self.safe_execute_read(_get))
+            return {status: list(pairs) for status, pairs in pending.items()}
+        except Exception as e:
+            logger.error(f"❌ Erreur récupération paires en attente: {e}")
+            return {'Buy': [], 'Sell': []}
+    
+    def _get_pending(self, status: str, columns=None):
+        """Paires en attente d'un statut, mises en cache jusqu'à la prochaine écriture"""
+        # Tuple: clé de cache hashable même si l'appelant passe une liste
+        columns = tuple(columns) if columns is not None else None
+        return list(self._cached_read(
+            ('pending', status, columns),
+            lambda: tuple(self.get_pairs_by_status(status, columns))
+        ))
+    
+    def get_all_pairs(self, limit: int = 100, columns=None):
+        """Récupère toutes les paires (tuples légers si columns est fourni)"""
         def _get(session, pair_limit):
-            return session.query(OrderPair).order_by(OrderPair.index.desc()).limit(pair_limit).all()
+            result = session.execute(
+                self._select_pairs(columns).order_by(OrderPair.index.desc()).limit(pair_limit)
+            )
+            return result.all() if columns else result.scalars().all()
         
         try:
-            return self.safe_execute(_get, limit)
+            return self.safe_execute_read(_get, limit)
         except Exception as e:
-            print(f"❌ Erreur récupération paires: {e}")
+            logger.error(f"❌ Erreur récupération paires: {e}")
             return []
     
     def get_pair_by_index(self, index: int):
         """Récupère une paire par son index"""
         def _get(session, pair_index):
-            return session.query(OrderPair).filter_by(index=pair_index).first()
+            return session.get(OrderPair, pair_index)
         
         try:
-            return self.safe_execute(_get, index)
+            return self.safe_execute_read(_get, index)
         except Exception as e:
-            print(f"❌ Erreur récupération paire {index}: {e}")
+            logger.error(f"❌ Erreur récupération paire {index}: {e}")
             return None
     
     def get_pair_by_buy_order_id(self, buy_order_id: str):
         """Récupère une paire par l'ID de l'ordre d'achat"""
         def _get(session, order_id):
-            return session.query(OrderPair).filter_by(buy_order_id=order_id).first()
+            return session.scalars(_SEL_BY_BUY_ORDER_ID, {'order_id': order_id}).first()
         
         try:
-            return self.safe_execute(_get, buy_order_id)
+            return self.safe_execute_read(_get, buy_order_id)
         except Exception as e:
-            print(f"❌ Erreur récupération paire by buy_order_id: {e}")
+            logger.error(f"❌ Erreur récupération paire by buy_order_id: {e}")
             return None
     
     def get_statistics(self):
-        """Retourne des statistiques sur les paires"""
+        """Retourne des statistiques sur les paires
+        
+        Résultat mis en cache jusqu'à la prochaine écriture (et READ_CACHE_TTL max)
+        """
         def _get_stats(session):
             stats = {}
             
-            # Total paires
-            stats['total_pairs'] = session.query(OrderPair).count()
+            # Comptes et gains par status en une seule requête GROUP BY
+            rows = session.execute(_SEL_STATS_BY_STATUS).all()
             
-            # Paires par status
-            stats['buy_pending'] = session.query(OrderPair).filter_by(status='Buy').count()
-            stats['sell_pending'] = session.query(OrderPair).filter_by(status='Sell').count()
-            stats['completed'] = session.query(OrderPair).filter_by(status='Complete').count()
-            
-            # Gains totaux
-            completed_pairs = session.query(OrderPair).filter_by(status='Complete').all()
-            total_gain = sum(p.gain_usdc for p in completed_pairs if p.gain_usdc)
-            profitable = len([p for p in completed_pairs if p.gain_usdc and p.gain_usdc > 0])
+            by_status = {status: (count, gain, wins) for status, count, gain, wins in rows}
+            stats['total_pairs'] = sum(count for count, _, _ in by_status.values())
+            stats['buy_pending'] = by_status.get('Buy', (0, 0, 0))[0]
+            stats['sell_pending'] = by_status.get('Sell', (0, 0, 0))[0]
+            completed, total_gain, profitable = by_status.get('Complete', (0, 0, 0))
+            stats['completed'] = completed
             
             stats['total_gain_usdc'] = total_gain
             stats['profitable_trades'] = profitable
@@ -519,48 +1011,128 @@ class Database:
             return stats
         
         try:
-            return self.safe_execute(_get_stats)
+            return dict(self._cached_read(('statistics',), lambda: self.safe_execute_read(_get_stats)))
         except Exception as e:
-            print(f"❌ Erreur récupération statistiques: {e}")
+            logger.error(f"❌ Erreur récupération statistiques: {e}")
             return {}
     
-    def get_active_order_pairs(self):
-        """Récupère toutes les paires actives (Buy et Sell)"""
-        def _get(session):
-            return session.query(OrderPair).filter(
-                OrderPair.status.in_(['Buy', 'Sell'])
-            ).all()
+    def iter_active_order_pairs(self):
+        """Itère sur les paires actives (Buy et Sell) par lots de 500 lignes
         
+        Générateur: la session reste ouverte pendant l'itération. Ne pas faire
+        de traitement long (appels API, sleep) entre deux éléments; utiliser
+        get_active_order_pairs() dans ce cas.
+        """
+        session = self.get_session()
         try:
-            return self.safe_execute(_get)
+            stmt = _SEL_ACTIVE.execution_options(yield_per=500)
+            
+            for pair in session.scalars(stmt):
+                yield pair
         except Exception as e:
-            print(f"❌ Erreur récupération paires actives: {e}")
-            return []
+            logger.error(f"❌ Erreur récupération paires actives: {e}")
+        finally:
+            session.close()
+    
+    def get_active_order_pairs(self):
+        """Récupère toutes les paires actives (Buy et Sell) sous forme de liste"""
+        return list(self.iter_active_order_pairs())
     
     def get_market_analysis_history(self, limit: int = 100):
         """Récupère l'historique des analyses de marché"""
         return []
     
-    def get_recent_trades(self, limit: int = 20):
-        """Récupère les trades récents (paires complétées)"""
-        def _get(session, trade_limit):
-            return session.query(OrderPair).filter_by(
-                status='Complete'
-            ).order_by(
-                OrderPair.completed_at.desc()
-            ).limit(trade_limit).all()
+    def get_recent_trades(self, limit: int = 20, columns=None):
+        """Récupère les trades récents (paires complétées)
         
+        Args:
+            limit: Nombre max de trades (les plus récents d'abord)
+            columns: Colonnes à charger (tuples légers, voir get_pairs_by_status)
+        """
+        # Tuple: clé de cache hashable même si l'appelant passe une liste
+        columns = tuple(columns) if columns is not None else None
         try:
-            return self.safe_execute(_get, limit)
+            return list(self._cached_read(
+                ('recent_trades', limit, columns),
+                lambda: self._get_recent_trades_impl(limit, columns)
+            ))
         except Exception as e:
-            print(f"❌ Erreur récupération trades récents: {e}")
+            logger.error(f"❌ Erreur récupération trades récents: {e}")
             return []
     
-    def __del__(self):
-        """Nettoyage propre lors de la destruction"""
+    def _get_recent_trades_impl(self, limit: int, columns=None):
+        """Requête des trades récents (mise en cache par get_recent_trades)"""
+        def _get(session, trade_limit):
+            if columns:
+                stmt = select(*columns).where(
+                    OrderPair.status == 'Complete'
+                ).order_by(OrderPair.completed_at.desc()).limit(trade_limit)
+                return session.execute(stmt).all()
+            return session.scalars(_SEL_RECENT_TRADES, {'limit': trade_limit}).all()
+        
+        return tuple(self.safe_execute_read(_get, limit))
+    
+    # ============================================
+    # FERMETURE
+    # ============================================
+    
+    def optimize(self):
+        """Exécute PRAGMA optimize (ANALYZE ciblé sur les tables aux statistiques périmées)"""
+        if self._engine is None:
+            return
         try:
-            if hasattr(self, '_engine') and self._engine:
-                self._engine.dispose()
-                print("🔌 Connexions base de données fermées proprement")
-        except:
-            pass
+            # engine.begin(): l'ANALYZE déclenché doit être validé (listener 'begin')
+            with self._engine.begin() as conn:
+                conn.exec_driver_sql("PRAGMA optimize")
+        except Exception as e:
+            logger.warning(f"⚠️  Warning PRAGMA optimize: {e}")
+    
+    def _schedule_optimize(self):
+        """Programme le prochain PRAGMA optimize (thread daemon)"""
+        self._optimize_timer = threading.Timer(OPTIMIZE_INTERVAL, self._periodic_optimize)
+        self._optimize_timer.daemon = True
+        self._optimize_timer.start()
+    
+    def _periodic_optimize(self):
+        """Tick du timer: optimise puis se reprogramme tant que la base est ouverte"""
+        if self._closed or not self._initialized:
+            return
+        self.optimize()
+        if not self._closed:
+            self._schedule_optimize()
+    
+    def close(self):
+        """Ferme définitivement les connexions (idempotent)
+        
+        Toute utilisation ultérieure lève RuntimeError: créer une nouvelle
+        instance de Database pour rouvrir la base.
+        """
+        self._closed = True
+        if self._optimize_timer is not None:
+            self._optimize_timer.cancel()
+            self._optimize_timer = None
+        
+        if self._scoped_session is not None:
+            self._scoped_session.remove()
+        
+        if self._engine is not None:
+            # Statistiques du planificateur à jour pour le prochain démarrage
+            self.optimize()
+            self._engine.dispose()
+            self._engine = None
+            logger.info("🔌 Connexions base de données fermées proprement")
+        
+        # Les sessions déjà créées restent liées à l'ancien moteur
+        self._thread_sessions = threading.local()
+        self._session_factory = None
+        self._initialized = False
+        # Plus de lecture servie depuis le cache une fois fermée
+        with self._read_cache_lock:
+            self._read_cache.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -2,12 +2,18 @@
 Package command - Modules de contrôle et logique métier
 """
 
-from command.bot_controller import BotController
-from command.buy_orders import BuyOrderManager
-from command.sell_orders import SellOrderManager
-from command.logger import TradingLogger
-from command.market_analyzer import MarketAnalyzer
-from command.trading_engine import TradingEngine
+import importlib
+
+# Exports chargés à la première utilisation (PEP 562): importer un sous-module
+# léger (ex: command.logger) ne charge plus ccxt ni le SDK Hyperliquid
+_LAZY_EXPORTS = {
+    'BotController': 'command.bot_controller',
+    'BuyOrderManager': 'command.buy_orders',
+    'SellOrderManager': 'command.sell_orders',
+    'TradingLogger': 'command.logger',
+    'MarketAnalyzer': 'command.market_analyzer',
+    'TradingEngine': 'command.trading_engine',
+}
 
 __all__ = [
     'BotController',
@@ -16,4 +22,18 @@ __all__ = [
     'TradingLogger',
     'MarketAnalyzer',
     'TradingEngine'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
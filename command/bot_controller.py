@@ -11,23 +11,63 @@ Version JSON - Utilise hyperliquid_complete_history.py et json_sync_orders.py
 
 import time
 import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 from config import TradingConfig
-from DB.database import Database
-from command.market_analyzer import MarketAnalyzer
-from command.trading_engine import TradingEngine
-from command.logger import TradingLogger
-from command.buy_orders import BuyOrderManager
-from command.sell_orders import SellOrderManager
-from command.hyperliquid_complete_history import HyperliquidHistoryService
+from DB.database import Database, OrderPair, CREATED_AT_ISO, COMPLETED_AT_ISO
+from command.logger import TradingLogger, BANNER
 from command.json_sync_orders import JsonOrderSynchronizer
 
-# Telegram (optionnel)
-try:
-    from telegram.telegram_notifier import TelegramNotifier
-except ImportError:
-    TelegramNotifier = None
+
+@dataclass(frozen=True)
+class OffsetSnapshot:
+    """Offsets et pourcentages de la config, comparés avant/après rechargement"""
+    __slots__ = (
+        'bull_buy_offset', 'bull_sell_offset', 'bear_buy_offset', 'bear_sell_offset',
+        'range_buy_offset', 'range_sell_offset', 'bull_percent', 'bear_percent', 'range_percent'
+    )
+    
+    bull_buy_offset: float
+    bull_sell_offset: float
+    bear_buy_offset: float
+    bear_sell_offset: float
+    range_buy_offset: float
+    range_sell_offset: float
+    bull_percent: float
+    bear_percent: float
+    range_percent: float
+    
+    @classmethod
+    def from_config(cls, config: TradingConfig) -> 'OffsetSnapshot':
+        """Capture les valeurs courantes de la configuration"""
+        return cls(*(getattr(config, name) for name in cls.__slots__))
+    
+    def diff(self, other: 'OffsetSnapshot') -> Dict:
+        """Changements vers other: {champ: {'old': ..., 'new': ...}}"""
+        changes = {}
+        for field in fields(self):
+            old, new = getattr(self, field.name), getattr(other, field.name)
+            if old != new:
+                changes[field.name] = {'old': old, 'new': new}
+        return changes
+
+
+# Colonnes affichées pour les ordres en attente (tuple constant: clé de cache BDD stable)
+PENDING_ORDER_COLUMNS = (
+    OrderPair.index, OrderPair.buy_order_id, OrderPair.sell_order_id,
+    OrderPair.buy_price_btc, OrderPair.sell_price_btc,
+    OrderPair.quantity_btc, CREATED_AT_ISO
+)
+
+# Colonnes des paires complétées (completed_at déjà formaté en ISO par SQLite)
+COMPLETED_PAIR_COLUMNS = (
+    OrderPair.index, OrderPair.buy_price_btc, OrderPair.sell_price_btc,
+    OrderPair.quantity_btc, OrderPair.gain_usdc, OrderPair.gain_percent,
+    OrderPair.market_type, COMPLETED_AT_ISO
+)
 
 
 class BotController:
@@ -40,35 +80,55 @@ class BotController:
     - SellOrderManager: Gère les ventes
     """
     
+    STATUS_CACHE_TTL = 2.0  # Durée de vie (s) du statut en cache (polling dashboard)
+    STATUS_STALE_MAX = 30.0  # Âge max (s) d'un statut servi pendant son recalcul
+    STATUS_CALL_TIMEOUT = 15  # Délai max (s) d'un appel du statut (BDD/API)
+    
     def __init__(self, config: TradingConfig):
         self.config = config
         self.logger = TradingLogger(config)
         
-        self.logger.info("="*60)
-        self.logger.info("🤖 INITIALISATION DU BOT (VERSION JSON)")
-        self.logger.info("="*60)
+        self.logger.banner("🤖 INITIALISATION DU BOT (VERSION JSON)")
         
-        # Initialiser les modules
-        self.database = Database(config)
-        self.market_analyzer = MarketAnalyzer(config)
-        self.trading_engine = TradingEngine(config)
+        # Modules de trading importés à la construction seulement (ccxt, SDK
+        # Hyperliquid, numpy): importer ce module pour l'API web reste léger
+        from command.market_analyzer import MarketAnalyzer
+        from command.trading_engine import TradingEngine
+        from command.buy_orders import BuyOrderManager
+        from command.sell_orders import SellOrderManager
+        from command.hyperliquid_complete_history import HyperliquidHistoryService
         
-        # Telegram (optionnel)
+        # Initialiser les modules
+        # Constructeurs indépendants (I/O disque et handshakes REST) lancés en
+        # parallèle: le démarrage coûte le plus lent au lieu de leur somme
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="BotInit") as executor:
+            database_future = executor.submit(Database, config)
+            engine_future = executor.submit(TradingEngine, config)
+            history_future = executor.submit(HyperliquidHistoryService)
+            
+            self.market_analyzer = MarketAnalyzer(config)
+            self.database = database_future.result()
+            self.trading_engine = engine_future.result()
+        
+        # Telegram (optionnel, importé seulement s'il est activé)
         self.telegram = None
-        if TelegramNotifier and config.telegram_enabled:
+        if config.telegram_enabled:
             try:
+                from telegram.telegram_notifier import TelegramNotifier
                 self.telegram = TelegramNotifier(
                     bot_token=config.telegram_bot_token,
                     chat_id=config.telegram_chat_id,
                     enabled=config.telegram_enabled
                 )
                 self.logger.info("✅ Notifications Telegram activées")
+            except ImportError:
+                self.logger.warning("⚠️  Module Telegram indisponible - notifications désactivées")
             except Exception as e:
                 self.logger.error(f"❌ Erreur Telegram: {e}")
         
         # Service d'historique Hyperliquid
         try:
-            self.history_service = HyperliquidHistoryService()
+            self.history_service = history_future.result()
             self.logger.info("✅ Service d'historique initialisé")
         except Exception as e:
             self.logger.error(f"❌ Erreur initialisation service d'historique: {e}")
@@ -89,24 +149,48 @@ class BotController:
             config, self.database, self.trading_engine, self.logger, self.telegram
         )
         
-        # État
-        self.is_running = False
-        
-        self.logger.info("="*60)
-        self.logger.info("✅ BOT INITIALISÉ (VERSION JSON)")
-        self.logger.info("="*60)
+        # Modules notifiés par reload_config() via on_config_reload(config)
+        self._config_subscribers = [
+            ("MarketAnalyzer", self.market_analyzer),
+            ("TradingEngine", self.trading_engine),
+            ("BuyOrderManager", self.buy_manager),
+            ("SellOrderManager", self.sell_manager),
+            ("Database", self.database),
+            ("JsonOrderSynchronizer", self.json_sync),
+        ]
+        
+        # État: Event lu sans verrou (is_running), transitions start/stop
+        # sérialisées (RLock: stop() peut être appelé par le handler de signal
+        # pendant un start() du thread principal)
+        self._running = threading.Event()
+        self._lifecycle_lock = threading.RLock()
+        # Horodatage ISO du statut, reformaté seulement quand la seconde change
+        self._iso_cache = (0, "")
+        # Dernier statut calculé (monotonic, statut): partagé par les requêtes simultanées
+        self._status_cache = (0.0, None)
+        self._status_lock = threading.Lock()
+        # Appels indépendants du statut (BDD + API) lancés en parallèle.
+        # Créé à la demande (sous _status_lock), fermé par stop()
+        self._status_pool = None
+        
+        self.logger.banner("✅ BOT INITIALISÉ (VERSION JSON)")
+    
+    @property
+    def is_running(self) -> bool:
+        """True entre start() et stop()"""
+        return self._running.is_set()
     
     def start(self):
         """Démarre le bot"""
-        if self.is_running:
-            self.logger.warning("⚠️  Bot déjà en cours d'exécution")
-            return
+        with self._lifecycle_lock:
+            if self._running.is_set():
+                self.logger.warning("⚠️  Bot déjà en cours d'exécution")
+                return
+            self._running.set()
         
-        self.logger.info("\n" + "="*60)
-        self.logger.info("🚀 DÉMARRAGE DU BOT")
-        self.logger.info("="*60)
+        self.logger.banner("🚀 DÉMARRAGE DU BOT", newline_before=True)
         
-        self.is_running = True
+        self._status_cache = (0.0, None)
         
         # 1. Démarrer le service d'historique Hyperliquid
         self.logger.info("\n📡 Démarrage du service d'historique...")
@@ -114,11 +198,9 @@ class BotController:
         
         # 2. Forcer une première récupération immédiate
         self.logger.info("🔄 Récupération initiale de l'historique...")
+        # (synchrone: les JSON sont remplacés atomiquement avant le retour)
         self.history_service.fetch_now()
         
-        # Attendre un peu que les JSON soient générés
-        time.sleep(2)
-        
         # 3. Forcer une première synchronisation
         self.logger.info("🔄 Synchronisation initiale de la BDD...")
         self.json_sync.force_sync()
@@ -136,15 +218,15 @@ class BotController:
         # Thread de vente
         self.sell_manager.start()
         
-        self.logger.info("="*60)
-        self.logger.info("✅ BOT DÉMARRÉ")
-        self.logger.info("="*60)
-        self.logger.info("\n💡 Architecture:")
-        self.logger.info("   📡 HyperliquidHistoryService → génère JSON toutes les X minutes")
-        self.logger.info("   🔄 JsonOrderSynchronizer → lit JSON et met à jour BDD")
-        self.logger.info("   🟢 BuyOrderManager → place ordres d'achat")
-        self.logger.info("   🔵 SellOrderManager → place ordres de vente")
-        self.logger.info("="*60 + "\n")
+        self.logger.banner("✅ BOT DÉMARRÉ")
+        self.logger.info(
+            "\n💡 Architecture:\n"
+            "   📡 HyperliquidHistoryService → génère JSON toutes les X minutes\n"
+            "   🔄 JsonOrderSynchronizer → lit JSON et met à jour BDD\n"
+            "   🟢 BuyOrderManager → place ordres d'achat\n"
+            "   🔵 SellOrderManager → place ordres de vente\n"
+            f"{BANNER}\n"
+        )
         
         # Notification Telegram
         if self.telegram:
@@ -155,15 +237,15 @@ class BotController:
     
     def stop(self):
         """Arrête le bot proprement"""
-        if not self.is_running:
-            self.logger.warning("⚠️  Bot non démarré")
-            return
+        with self._lifecycle_lock:
+            if not self._running.is_set():
+                self.logger.warning("⚠️  Bot non démarré")
+                return
+            self._running.clear()
         
-        self.logger.info("\n" + "="*60)
-        self.logger.info("🛑 ARRÊT DU BOT")
-        self.logger.info("="*60)
+        self.logger.banner("🛑 ARRÊT DU BOT", newline_before=True)
         
-        self.is_running = False
+        self._status_cache = (0.0, None)
         
         # Arrêter les threads dans l'ordre
         self.logger.info("🛑 Arrêt des modules...")
@@ -178,29 +260,115 @@ class BotController:
         # 3. Arrêter le service d'historique
         self.history_service.stop()
         
-        self.logger.info("="*60)
-        self.logger.info("✅ BOT ARRÊTÉ")
-        self.logger.info("="*60)
+        # 4. Fermer le pool du statut (recréé au prochain get_status).
+        # Sous _status_lock: aucun calcul de statut en cours ne l'utilise
+        with self._status_lock:
+            status_pool, self._status_pool = self._status_pool, None
+        if status_pool is not None:
+            status_pool.shutdown(wait=False)
+        
+        self.logger.banner("✅ BOT ARRÊTÉ")
         
         # Notification Telegram
         if self.telegram:
             self.telegram.send_bot_stopped()
+            # Envoi asynchrone: laisser partir les derniers messages avant la sortie
+            self.telegram.flush(timeout=2)
+    
+    def _utc_now_iso(self) -> str:
+        """Horodatage UTC ISO 8601 à la seconde, mis en cache entre deux secondes
+        
+        get_status est interrogé en boucle par le dashboard: on évite de
+        recréer un datetime et sa chaîne ISO à chaque appel.
+        """
+        now = int(time.time())
+        second, formatted = self._iso_cache
+        if now != second:
+            formatted = datetime.fromtimestamp(now, timezone.utc).isoformat()
+            self._iso_cache = (now, formatted)
+        return formatted
+    
+    def get_status(self, max_age: float = STATUS_CACHE_TTL) -> Dict:
+        """Retourne le statut actuel du bot
+        
+        Un statut expiré depuis moins de STATUS_STALE_MAX est servi tel quel
+        pendant qu'un thread le recalcule: le dashboard n'attend pas les API.
+        
+        Args:
+            max_age: Âge max (s) d'un statut en cache réutilisable; les rafraîchissements
+                     rapprochés du dashboard partagent un seul calcul (BDD + API).
+                     0 pour forcer un recalcul.
+        """
+        # Lecture sans verrou du dernier statut publié (tuple remplacé d'un bloc)
+        computed_at, cached = self._status_cache
+        if cached is not None and max_age > 0:
+            age = time.monotonic() - computed_at
+            if age < max_age:
+                return self._with_live_state(cached)
+            if age < self.STATUS_STALE_MAX:
+                self._refresh_status_async()
+                return self._with_live_state(cached)
+        
+        with self._status_lock:
+            computed_at, cached = self._status_cache
+            if cached is not None and time.monotonic() - computed_at < max_age:
+                return self._with_live_state(cached)
+            return self._with_live_state(self._refresh_status())
+    
+    def _with_live_state(self, status: Dict) -> Dict:
+        """Copie du statut avec is_running à jour (le cache peut précéder start/stop)"""
+        return {**status, 'is_running': self.is_running}
+    
+    def _refresh_status(self) -> Dict:
+        """Recalcule le statut et le publie dans le cache (sauf erreur)"""
+        status = self._build_status()
+        if 'error' not in status:
+            self._status_cache = (time.monotonic(), status)
+        return status
     
-    def get_status(self) -> Dict:
-        """Retourne le statut actuel du bot"""
+    def _refresh_status_async(self):
+        """Recalcule le statut dans un thread (un seul recalcul à la fois)"""
+        if not self._status_lock.acquire(blocking=False):
+            return
+        
+        def _refresh():
+            try:
+                self._refresh_status()
+            except Exception as e:
+                self.logger.error(f"❌ Erreur rafraîchissement statut: {e}")
+            finally:
+                self._status_lock.release()
+        
+        threading.Thread(target=_refresh, daemon=True, name="StatusRefresh").start()
+    
+    def _build_status(self) -> Dict:
+        """Calcule le statut du bot (BDD, balances, marché, santé)"""
         try:
-            # Statistiques BDD
-            stats = self.database.get_statistics()
-            
-            # Balances
-            usdc_balance = self.trading_engine.get_balance("USDC")
-            btc_position = self.trading_engine.get_position(self.config.symbol)
-            
-            # Analyse marché actuelle
-            market_analysis = self.market_analyzer.analyze_market()
-            
-            # État de santé des connexions
+            # État de santé des connexions (local) en premier: SDK coupé (circuit
+            # OPEN) = balances et position refusées d'office, inutile de les demander
             health = self.trading_engine.get_health_status()
+            sdk_down = self.trading_engine.sdk_circuit_breaker.is_rejecting()
+            
+            # Statistiques BDD, balances et analyse marché: I/O indépendantes,
+            # la latence est celle du plus lent au lieu de la somme
+            # Appelé sous _status_lock (get_status / _refresh_status_async)
+            if self._status_pool is None:
+                self._status_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="Status")
+            status_pool = self._status_pool
+            stats_future = status_pool.submit(self.database.get_statistics)
+            market_future = status_pool.submit(self.market_analyzer.analyze_market_cached)
+            if not sdk_down:
+                usdc_future = status_pool.submit(self.trading_engine.get_balance, "USDC")
+                position_future = status_pool.submit(self.trading_engine.get_position, self.config.symbol)
+            
+            stats = stats_future.result(timeout=self.STATUS_CALL_TIMEOUT)
+            market_analysis = market_future.result(timeout=self.STATUS_CALL_TIMEOUT)
+            if sdk_down:
+                # Mêmes valeurs que get_balance/get_position en cas d'échec
+                usdc_balance, btc_position = 0.0, {}
+            else:
+                usdc_balance = usdc_future.result(timeout=self.STATUS_CALL_TIMEOUT)
+                btc_position = position_future.result(timeout=self.STATUS_CALL_TIMEOUT)
             
             # Statut des managers
             buy_status = {'running': self.buy_manager.running}
@@ -208,7 +376,7 @@ class BotController:
             
             return {
                 'is_running': self.is_running,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'timestamp': self._utc_now_iso(),
                 'architecture': 'JSON-based',
                 'statistics': stats,
                 'balances': {
@@ -244,30 +412,35 @@ class BotController:
     def get_pending_orders(self) -> Dict:
         """Retourne les ordres en attente"""
         try:
-            pending_buy = self.database.get_pending_buy_orders()
-            pending_sell = self.database.get_pending_sell_orders()
-            
+            # Achats et ventes en une requête, seulement les colonnes affichées
+            # (created_at déjà formaté en ISO par SQLite)
+            pending = self.database.get_pending_pairs(columns=PENDING_ORDER_COLUMNS)
+            pending_buy = pending['Buy']
+            pending_sell = pending['Sell']
+            
+            # Déballage positionnel des lignes (status, *PENDING_ORDER_COLUMNS):
+            # bien moins coûteux que l'accès par attribut sur un Row SQLAlchemy
             return {
                 'buy_orders': [
                     {
-                        'index': p.index,
-                        'buy_order_id': p.buy_order_id,
-                        'buy_price': p.buy_price_btc,
-                        'quantity': p.quantity_btc,
-                        'created_at': p.created_at.isoformat() if p.created_at else None
+                        'index': index,
+                        'buy_order_id': buy_order_id,
+                        'buy_price': buy_price,
+                        'quantity': quantity,
+                        'created_at': created_at
                     }
-                    for p in pending_buy
+                    for _, index, buy_order_id, _, buy_price, _, quantity, created_at in pending_buy
                 ],
                 'sell_orders': [
                     {
-                        'index': p.index,
-                        'sell_order_id': p.sell_order_id,
-                        'buy_price': p.buy_price_btc,
-                        'sell_price': p.sell_price_btc,
-                        'quantity': p.quantity_btc,
-                        'created_at': p.created_at.isoformat() if p.created_at else None
+                        'index': index,
+                        'sell_order_id': sell_order_id,
+                        'buy_price': buy_price,
+                        'sell_price': sell_price,
+                        'quantity': quantity,
+                        'created_at': created_at
                     }
-                    for p in pending_sell
+                    for _, index, _, sell_order_id, buy_price, sell_price, quantity, created_at in pending_sell
                 ]
             }
             
@@ -282,22 +455,24 @@ class BotController:
     def get_completed_pairs(self, limit: int = 50) -> List[Dict]:
         """Retourne les paires complétées"""
         try:
-            all_pairs = self.database.get_all_pairs(limit=limit)
-            
-            completed = [p for p in all_pairs if p.status == 'Complete']
+            # Filtre status='Complete' + tri completed_at en SQL (index dédié),
+            # seulement les colonnes affichées
+            completed = self.database.get_recent_trades(limit=limit, columns=COMPLETED_PAIR_COLUMNS)
             
+            # Déballage positionnel des lignes (ordre de COMPLETED_PAIR_COLUMNS)
             return [
                 {
-                    'index': p.index,
-                    'buy_price': p.buy_price_btc,
-                    'sell_price': p.sell_price_btc,
-                    'quantity': p.quantity_btc,
-                    'gain_usdc': p.gain_usdc,
-                    'gain_percent': p.gain_percent,
-                    'market_type': p.market_type,
-                    'completed_at': p.completed_at.isoformat() if p.completed_at else None
+                    'index': index,
+                    'buy_price': buy_price,
+                    'sell_price': sell_price,
+                    'quantity': quantity,
+                    'gain_usdc': gain_usdc,
+                    'gain_percent': gain_percent,
+                    'market_type': market_type,
+                    'completed_at': completed_at
                 }
-                for p in completed
+                for index, buy_price, sell_price, quantity, gain_usdc, gain_percent, market_type, completed_at
+                in completed
             ]
             
         except Exception as e:
@@ -316,8 +491,8 @@ class BotController:
             
             if result:
                 self.logger.info(f"✅ Ordre {order_id} annulé")
-                # Forcer une nouvelle récupération de l'historique
-                self.history_service.fetch_now()
+                # Demander une nouvelle récupération de l'historique (thread du service)
+                self.history_service.request_fetch()
             else:
                 self.logger.error(f"❌ Échec annulation ordre {order_id}")
             
@@ -336,8 +511,8 @@ class BotController:
             
             if result:
                 self.logger.info("✅ Tous les ordres annulés")
-                # Forcer une nouvelle récupération de l'historique
-                self.history_service.fetch_now()
+                # Demander une nouvelle récupération de l'historique (thread du service)
+                self.history_service.request_fetch()
             else:
                 self.logger.error("❌ Échec annulation des ordres")
             
@@ -354,8 +529,7 @@ class BotController:
         # 1. Récupérer l'historique
         self.history_service.fetch_now()
         
-        # 2. Synchroniser la BDD
-        time.sleep(1)  # Laisser le temps aux fichiers d'être écrits
+        # 2. Synchroniser la BDD (JSON déjà écrits: fetch_now est synchrone)
         self.json_sync.force_sync()
         
         self.logger.info("✅ Synchronisation forcée terminée")
@@ -366,23 +540,14 @@ class BotController:
         Returns:
             dict: Résultat du rechargement avec succès et détails
         """
+        # Horodatage unique pour toutes les branches de la réponse
+        now_iso = self._utc_now_iso()
+        
         try:
-            self.logger.info("="*60)
-            self.logger.info("🔄 RECHARGEMENT DE LA CONFIGURATION")
-            self.logger.info("="*60)
+            self.logger.banner("🔄 RECHARGEMENT DE LA CONFIGURATION")
             
             # Sauvegarder l'ancienne config pour comparaison
-            old_config = {
-                'bull_buy_offset': self.config.bull_buy_offset,
-                'bull_sell_offset': self.config.bull_sell_offset,
-                'bear_buy_offset': self.config.bear_buy_offset,
-                'bear_sell_offset': self.config.bear_sell_offset,
-                'range_buy_offset': self.config.range_buy_offset,
-                'range_sell_offset': self.config.range_sell_offset,
-                'bull_percent': self.config.bull_percent,
-                'bear_percent': self.config.bear_percent,
-                'range_percent': self.config.range_percent,
-            }
+            old_offsets = OffsetSnapshot.from_config(self.config)
             
             # 1. Recharger la configuration
             success = self.config.reload()
@@ -392,76 +557,35 @@ class BotController:
                 return {
                     'success': False,
                     'message': 'Échec du rechargement de la configuration',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
+                    'timestamp': now_iso
                 }
             
-            # 2. Propager la nouvelle config aux modules
-            self.logger.info("📡 Propagation de la configuration aux modules...")
-            
-            # Market Analyzer
-            if hasattr(self, 'market_analyzer') and self.market_analyzer:
-                self.market_analyzer.config = self.config
-                self.logger.info("   ✅ MarketAnalyzer mis à jour")
-            
-            # Trading Engine
-            if hasattr(self, 'trading_engine') and self.trading_engine:
-                self.trading_engine.config = self.config
-                self.logger.info("   ✅ TradingEngine mis à jour")
-            
-            # Buy Manager
-            if hasattr(self, 'buy_manager') and self.buy_manager:
-                self.buy_manager.config = self.config
-                self.logger.info("   ✅ BuyOrderManager mis à jour")
-            
-            # Sell Manager
-            if hasattr(self, 'sell_manager') and self.sell_manager:
-                self.sell_manager.config = self.config
-                self.logger.info("   ✅ SellOrderManager mis à jour")
-            
-            # Database
-            if hasattr(self, 'database') and self.database:
-                self.database.config = self.config
-                self.logger.info("   ✅ Database mis à jour")
-            
-            # JSON Sync
-            if hasattr(self, 'json_sync') and self.json_sync:
-                self.json_sync.config = self.config
-                self.logger.info("   ✅ JsonOrderSynchronizer mis à jour")
-            
-            # 3. Préparer le résumé des changements
-            new_config = {
-                'bull_buy_offset': self.config.bull_buy_offset,
-                'bull_sell_offset': self.config.bull_sell_offset,
-                'bear_buy_offset': self.config.bear_buy_offset,
-                'bear_sell_offset': self.config.bear_sell_offset,
-                'range_buy_offset': self.config.range_buy_offset,
-                'range_sell_offset': self.config.range_sell_offset,
-                'bull_percent': self.config.bull_percent,
-                'bear_percent': self.config.bear_percent,
-                'range_percent': self.config.range_percent,
-            }
-            
-            changes = {}
-            for key in old_config:
-                if old_config[key] != new_config[key]:
-                    changes[key] = {
-                        'old': old_config[key],
-                        'new': new_config[key]
-                    }
-            
-            self.logger.info("="*60)
-            self.logger.info("✅ Configuration rechargée et propagée avec succès")
-            self.logger.info("="*60)
+            if self.config.last_reload_changed:
+                # 2. Propager la nouvelle config aux modules
+                self.logger.info("📡 Propagation de la configuration aux modules...")
+                
+                # Chaque module applique la config et recalcule ses valeurs dérivées
+                for name, module in self._config_subscribers:
+                    module.on_config_reload(self.config)
+                    self.logger.info(f"   ✅ {name} mis à jour")
+                
+                # 3. Préparer le résumé des changements
+                changes = old_offsets.diff(OffsetSnapshot.from_config(self.config))
+                
+                self.logger.banner("✅ Configuration rechargée et propagée avec succès")
+            else:
+                # Fichier .env inchangé: rien à propager ni à notifier
+                changes = {}
+                self.logger.info("ℹ️  Fichier .env inchangé, aucune propagation nécessaire")
             
             # Notification Telegram
             if self.telegram and changes:
                 try:
-                    changes_text = "\n".join([
-                        f"{k}: {v['old']} → {v['new']}"
-                        for k, v in changes.items()
-                    ])
+                    # Message formaté une fois, mis en file d'envoi (non bloquant)
                     self.telegram.send_message(
-                        f"🔄 Configuration rechargée\n\nChangements:\n{changes_text}"
+                        "🔄 Configuration rechargée\n\nChangements:\n" + "\n".join(
+                            f"{k}: {v['old']} → {v['new']}" for k, v in changes.items()
+                        )
                     )
                 except Exception as e:
                     self.logger.error(f"❌ Erreur notification Telegram: {e}")
@@ -470,7 +594,7 @@ class BotController:
                 'success': True,
                 'message': 'Configuration rechargée avec succès',
                 'changes': changes,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'timestamp': now_iso,
                 'config': {
                     'bull_market': {
                         'buy_offset': self.config.bull_buy_offset,
@@ -510,12 +634,11 @@ class BotController:
             
         except Exception as e:
             self.logger.error(f"❌ Erreur lors du rechargement de la configuration: {e}")
-            import traceback
             traceback.print_exc()
             
             return {
                 'success': False,
                 'message': f'Erreur: {str(e)}',
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             }
 
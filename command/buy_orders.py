@@ -5,13 +5,34 @@ Logique: Attendre interval -> Créer ordre -> Enregistrer BDD -> Boucler
 
 import time
 import threading
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Dict, Optional
 from config import TradingConfig
 from DB.database import Database
 from command.trading_engine import TradingEngine
 from command.market_analyzer import MarketAnalyzer
-from command.logger import TradingLogger
+from command.logger import TradingLogger, BANNER
+
+
+@dataclass(frozen=True)
+class BuyParams:
+    """Paramètres d'un ordre d'achat calculés par _calculate_buy_parameters"""
+    __slots__ = (
+        'buy_price', 'sell_price', 'buy_offset', 'sell_offset', 'quantity_usdc',
+        'quantity_btc', 'percent', 'market_type', 'current_price', 'offset_display'
+    )
+    
+    buy_price: float
+    sell_price: float
+    buy_offset: float
+    sell_offset: float
+    quantity_usdc: float
+    quantity_btc: float
+    percent: float
+    market_type: str
+    current_price: float
+    offset_display: str
 
 
 class BuyOrderManager:
@@ -20,7 +41,6 @@ class BuyOrderManager:
     def __init__(self, config: TradingConfig, database: Database, 
                  trading_engine: TradingEngine, market_analyzer: MarketAnalyzer, 
                  logger: TradingLogger, telegram=None):
-        self.config = config
         self.database = database
         self.trading_engine = trading_engine
         self.market_analyzer = market_analyzer
@@ -30,10 +50,55 @@ class BuyOrderManager:
         # État
         self.running = False
         self.thread = None
-        self.last_buy_time = None
+        self.last_buy_time = None  # Horodatage UTC du dernier achat (affichage)
+        self._last_buy_monotonic = None  # Même instant en time.monotonic (calcul d'intervalle)
+        # Fin de la pause en cours (time.monotonic), voir _pause()
+        self._resume_at = 0.0
+        # Réveille la boucle avant la fin de l'attente (stop() / on_config_reload())
+        self._wake_event = threading.Event()
+        
+        self._apply_config(config)
         
         self.logger.info("🟢 [BUY ORDERS] Module initialisé")
     
+    def on_config_reload(self, config: TradingConfig):
+        """Applique une configuration rechargée (lue au prochain tour de boucle)"""
+        self._apply_config(config)
+        # Recalculer l'attente avec les nouveaux intervalles
+        self._wake_event.set()
+    
+    def _apply_config(self, config: TradingConfig):
+        """Enregistre la config et précalcule les valeurs lues à chaque tour de boucle"""
+        self.config = config
+        
+        # On utilise le plus court intervalle pour être réactif
+        self._min_interval_s = min(
+            config.bull_auto_interval_new,
+            config.bear_auto_interval_new,
+            config.range_auto_interval_new
+        ) * 60
+        
+        # TIME_PAUSE en minutes par type de marché (RANGE par défaut)
+        self._pause_by_market = {
+            'BULL': config.bull_time_pause,
+            'BEAR': config.bear_time_pause,
+            'RANGE': config.range_time_pause
+        }
+        
+        # Achats autorisés par type de marché (BUY_ENABLED global inclus)
+        self._buy_enabled_by_market = {
+            'BULL': config.buy_enabled and config.bull_buy_enabled,
+            'BEAR': config.buy_enabled and config.bear_buy_enabled,
+            'RANGE': config.buy_enabled and config.range_buy_enabled
+        }
+        
+        # (buy_offset, sell_offset, percent) par type de marché (RANGE par défaut)
+        self._offsets_by_market = {
+            'BULL': (config.bull_buy_offset, config.bull_sell_offset, config.bull_percent),
+            'BEAR': (config.bear_buy_offset, config.bear_sell_offset, config.bear_percent),
+            'RANGE': (config.range_buy_offset, config.range_sell_offset, config.range_percent)
+        }
+    
     def start(self):
         """Démarre le thread d'achat (1 SEUL THREAD)"""
         if self.running:
@@ -41,6 +106,7 @@ class BuyOrderManager:
             return
         
         self.running = True
+        self._wake_event.clear()
         self.thread = threading.Thread(target=self._buy_loop, daemon=True, name="BuyThread")
         self.thread.start()
         self.logger.info("✅ Thread d'achat démarré")
@@ -52,6 +118,7 @@ class BuyOrderManager:
         
         self.logger.info("🛑 Arrêt du thread d'achat...")
         self.running = False
+        self._wake_event.set()
         
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=5)
@@ -64,17 +131,19 @@ class BuyOrderManager:
         
         while self.running:
             try:
-                # 1. Attendre l'interval
-                if not self._should_place_buy():
-                    # Vérifier toutes les minutes si l'intervalle est atteint
-                    time.sleep(60)
+                # 1. Attendre la fin de la pause et de l'interval
+                # (attente interrompue par stop() ou on_config_reload())
+                wait_seconds = self._seconds_until_next_buy()
+                if wait_seconds > 0:
+                    self._wake_event.wait(wait_seconds)
+                    self._wake_event.clear()
                     continue
                 
                 # 2. Analyser le marché
-                analysis = self.market_analyzer.analyze_market()
+                analysis = self.market_analyzer.analyze_market_cached()
                 if 'error' in analysis:
                     self.logger.error(f"❌ Erreur analyse marché: {analysis['error']}")
-                    time.sleep(60)
+                    self._pause(60)
                     continue
                 
                 market_type = analysis['market_type']
@@ -86,114 +155,113 @@ class BuyOrderManager:
                 # 3. Vérifier si on peut acheter pour ce type de marché
                 if not self._can_buy_for_market(market_type):
                     # ⚠️ FIX: Marquer la tentative pour éviter les boucles infinies
-                    self.last_buy_time = datetime.now(timezone.utc)
+                    self._mark_buy_attempt()
                     self.logger.warning(f"⚠️  Achat désactivé pour marché {market_type}")
                     
                     # Pause avant prochaine vérification
                     pause_minutes = self._get_time_pause_for_market(market_type)
-                    time.sleep(pause_minutes * 60)
+                    self._pause(pause_minutes * 60)
+                    continue
+                
+                # 4. Solde USDC (un seul appel API, réutilisé pour les paramètres):
+                # solde insuffisant = échec connu d'avance, pas de calcul ni d'ordre
+                balance_details = self.trading_engine.get_balance_details("USDC")
+                percent = self._offsets_by_market.get(market_type, self._offsets_by_market['RANGE'])[2]
+                order_value = balance_details['available'] * (percent / 100)
+                if order_value < self.config.min_order_value_usdc:
+                    self._mark_buy_attempt()
+                    self.logger.warning(
+                        f"⚠️  Solde USDC insuffisant: {order_value:.2f}$ "
+                        f"< {self.config.min_order_value_usdc}$ ({percent}% du disponible)"
+                    )
+                    
+                    pause_minutes = self._get_time_pause_for_market(market_type)
+                    self._pause(pause_minutes * 60)
                     continue
                 
-                # 4. Calculer les paramètres d'achat
-                buy_params = self._calculate_buy_parameters(market_type, current_price, range_limits)
+                # 5. Calculer les paramètres d'achat
+                buy_params = self._calculate_buy_parameters(
+                    market_type, current_price, range_limits, balance_details
+                )
                 
-                # 5. Placer l'ordre d'achat
+                # 6. Placer l'ordre d'achat
                 order_result = self._place_buy_order(buy_params, market_type)
                 
                 # ⚠️ FIX CRITIQUE: Mettre à jour last_buy_time TOUJOURS
                 # (même en cas d'échec) pour éviter les boucles infinies
-                self.last_buy_time = datetime.now(timezone.utc)
+                self._mark_buy_attempt()
                 
                 if order_result:
                     self.logger.info("✅ Ordre d'achat placé avec succès")
                 else:
                     self.logger.error("❌ Échec placement ordre d'achat")
                 
-                # 6. ⚠️ FIX: Pause selon TIME_PAUSE du marché (en minutes -> convertir en secondes)
+                # 7. ⚠️ FIX: Pause selon TIME_PAUSE du marché (en minutes -> convertir en secondes)
                 pause_minutes = self._get_time_pause_for_market(market_type)
-                pause_seconds = pause_minutes * 60
                 self.logger.info(f"⏸️  Pause de {pause_minutes} minutes avant prochaine vérification")
-                time.sleep(pause_seconds)
+                self._pause(pause_minutes * 60)
                 
             except Exception as e:
-                self.logger.error(f"❌ Erreur dans boucle d'achat: {e}")
-                import traceback
-                traceback.print_exc()
-                time.sleep(60)
+                self.logger.exception(f"❌ Erreur dans boucle d'achat: {e}")
+                self._pause(60)
         
         self.logger.info("🔚 Boucle d'achat terminée")
     
     def _get_time_pause_for_market(self, market_type: str) -> int:
         """Retourne le TIME_PAUSE en minutes selon le type de marché"""
-        if market_type == 'BULL':
-            return self.config.bull_time_pause
-        elif market_type == 'BEAR':
-            return self.config.bear_time_pause
-        else:  # RANGE
-            return self.config.range_time_pause
+        return self._pause_by_market.get(market_type, self._pause_by_market['RANGE'])
+    
+    def _mark_buy_attempt(self):
+        """Horodate une tentative d'achat (point de départ du prochain intervalle)"""
+        self._last_buy_monotonic = time.monotonic()
+        self.last_buy_time = datetime.now(timezone.utc)
     
-    def _should_place_buy(self) -> bool:
-        """Vérifie si on doit placer un ordre d'achat (intervalle atteint)"""
-        if self.last_buy_time is None:
-            return True  # Premier ordre
+    def _pause(self, seconds: float):
+        """Suspend les achats pendant seconds (attente faite en tête de boucle)"""
+        self._resume_at = time.monotonic() + seconds
+    
+    def _seconds_until_next_buy(self) -> float:
+        """Secondes restantes avant le prochain achat (0 si pause et intervalle écoulés)"""
+        now = time.monotonic()
+        pause_left = self._resume_at - now
         
-        # Récupérer l'intervalle depuis la config
-        # On utilise le plus court intervalle pour être réactif
-        min_interval = min(
-            self.config.bull_auto_interval_new,
-            self.config.bear_auto_interval_new,
-            self.config.range_auto_interval_new
-        )
+        if self._last_buy_monotonic is None:
+            return max(pause_left, 0.0)  # Premier ordre
         
-        elapsed_minutes = (datetime.now(timezone.utc) - self.last_buy_time).total_seconds() / 60
+        elapsed = now - self._last_buy_monotonic
+        interval_left = self._min_interval_s - elapsed
         
-        if elapsed_minutes >= min_interval:
-            self.logger.info(f"⏰ Interval atteint ({elapsed_minutes:.1f}/{min_interval} min)")
-            return True
+        if pause_left <= 0 and interval_left <= 0:
+            self.logger.info(
+                f"⏰ Interval atteint ({elapsed / 60:.1f}/{self._min_interval_s / 60:g} min)"
+            )
+            return 0.0
         
-        return False
+        return max(pause_left, interval_left, 0.0)
     
     def _can_buy_for_market(self, market_type: str) -> bool:
         """Vérifie si on peut acheter pour ce type de marché"""
-        # Vérifier si les achats sont activés globalement
-        if not self.config.buy_enabled:
-            return False
-        
-        # Vérifier selon le type de marché
-        if market_type == 'BULL' and not self.config.bull_buy_enabled:
-            return False
-        elif market_type == 'BEAR' and not self.config.bear_buy_enabled:
-            return False
-        elif market_type == 'RANGE' and not self.config.range_buy_enabled:
-            return False
-        
-        return True
+        # Type inconnu: seul l'interrupteur global s'applique
+        return self._buy_enabled_by_market.get(market_type, self.config.buy_enabled)
     
     def _calculate_buy_parameters(self, market_type: str, current_price: float, 
-                                   range_limits: dict = None) -> Dict:
-        """Calcule les paramètres d'achat selon le type de marché"""
+                                   range_limits: dict = None,
+                                   balance_details: dict = None) -> BuyParams:
+        """Calcule les paramètres d'achat selon le type de marché
         
-        if market_type == 'BULL':
-            buy_offset = self.config.bull_buy_offset
-            sell_offset = self.config.bull_sell_offset
-            percent = self.config.bull_percent
-            
-        elif market_type == 'BEAR':
-            buy_offset = self.config.bear_buy_offset
-            sell_offset = self.config.bear_sell_offset
-            percent = self.config.bear_percent
-            
-        else:  # RANGE
-            # Calcul dynamique si disponible
-            if range_limits and range_limits.get('delta', 0) > 0:
-                offset_amplitude = range_limits['delta'] * (self.config.range_dynamic_percent / 100) / 2
-                buy_offset = -offset_amplitude
-                sell_offset = offset_amplitude
-            else:
-                buy_offset = self.config.range_buy_offset
-                sell_offset = self.config.range_sell_offset
-            
-            percent = self.config.range_percent
+        Args:
+            balance_details: Solde USDC déjà récupéré (get_balance_details)
+        """
+        
+        buy_offset, sell_offset, percent = self._offsets_by_market.get(
+            market_type, self._offsets_by_market['RANGE']
+        )
+        
+        # RANGE: calcul dynamique des offsets si disponible
+        if market_type not in ('BULL', 'BEAR') and range_limits and range_limits.get('delta', 0) > 0:
+            offset_amplitude = range_limits['delta'] * (self.config.range_dynamic_percent / 100) / 2
+            buy_offset = -offset_amplitude
+            sell_offset = offset_amplitude
         
         # Prix d'achat = prix spot + offset
         buy_price = current_price + buy_offset
@@ -201,32 +269,33 @@ class BuyOrderManager:
         # Prix de vente cible = prix spot + sell_offset
         sell_price = current_price + sell_offset
         
-        # Calculer la quantité
-        balance_usdc = self.trading_engine.get_balance("USDC", available_only=True)
-        quantity_usdc = balance_usdc * (percent / 100)
-        quantity_btc = self.trading_engine.calculate_order_size(buy_price, percent)
+        # Calculer la quantité (un seul appel API pour le solde)
+        if balance_details is None:
+            balance_details = self.trading_engine.get_balance_details("USDC")
+        quantity_usdc = balance_details['available'] * (percent / 100)
+        quantity_btc = self.trading_engine.calculate_order_size(buy_price, percent, balance_details)
         
         # Format d'affichage des offsets
         offset_display = f"{buy_offset:.2f}/{sell_offset:.2f}"
         
-        return {
-            'buy_price': buy_price,
-            'sell_price': sell_price,
-            'buy_offset': buy_offset,
-            'sell_offset': sell_offset,
-            'quantity_usdc': quantity_usdc,
-            'quantity_btc': quantity_btc,
-            'percent': percent,
-            'market_type': market_type,
-            'current_price': current_price,
-            'offset_display': offset_display
-        }
+        return BuyParams(
+            buy_price=buy_price,
+            sell_price=sell_price,
+            buy_offset=buy_offset,
+            sell_offset=sell_offset,
+            quantity_usdc=quantity_usdc,
+            quantity_btc=quantity_btc,
+            percent=percent,
+            market_type=market_type,
+            current_price=current_price,
+            offset_display=offset_display
+        )
     
-    def _place_buy_order(self, buy_params: Dict, market_type: str) -> Optional[Dict]:
+    def _place_buy_order(self, buy_params: BuyParams, market_type: str) -> Optional[Dict]:
         """Place un ordre d'achat et l'enregistre dans la BDD"""
         
-        buy_price = buy_params['buy_price']
-        quantity_btc = buy_params['quantity_btc']
+        buy_price = buy_params.buy_price
+        quantity_btc = buy_params.quantity_btc
         
         # Vérifier que la quantité est valide
         if quantity_btc <= 0:
@@ -239,16 +308,19 @@ class BuyOrderManager:
             self.logger.error(f"❌ Valeur trop faible: {order_value:.2f}$ < {self.config.min_order_value_usdc}$")
             return None
         
-        self.logger.info(f"\n{'='*60}")
-        self.logger.info(f"🟢 PLACEMENT ORDRE D'ACHAT")
-        self.logger.info(f"{'='*60}")
-        self.logger.info(f"   Marché: {market_type}")
-        self.logger.info(f"   Prix: {buy_price:.2f}$ (offset: {buy_params['buy_offset']:.2f}$)")
-        self.logger.info(f"   Prix vente cible: {buy_params['sell_price']:.2f}$")
-        self.logger.info(f"   Quantité: {quantity_btc:.8f} BTC")
-        self.logger.info(f"   Valeur: {order_value:.2f} USDC")
-        self.logger.info(f"   Pourcentage: {buy_params['percent']}%")
-        self.logger.info(f"{'='*60}")
+        # Récapitulatif en un seul enregistrement de log
+        self.logger.info(
+            f"\n{BANNER}\n"
+            f"🟢 PLACEMENT ORDRE D'ACHAT\n"
+            f"{BANNER}\n"
+            f"   Marché: {market_type}\n"
+            f"   Prix: {buy_price:.2f}$ (offset: {buy_params.buy_offset:.2f}$)\n"
+            f"   Prix vente cible: {buy_params.sell_price:.2f}$\n"
+            f"   Quantité: {quantity_btc:.8f} BTC\n"
+            f"   Valeur: {order_value:.2f} USDC\n"
+            f"   Pourcentage: {buy_params.percent}%\n"
+            f"{BANNER}"
+        )
         
         # Placer l'ordre via le trading engine
         order_result = self.trading_engine.execute_buy_order(buy_price, quantity_btc)
@@ -278,13 +350,13 @@ class BuyOrderManager:
         # Enregistrer dans la BDD
         try:
             pair_index = self.database.create_buy_order_pair({
-                'quantity_usdc': buy_params['quantity_usdc'],
+                'quantity_usdc': buy_params.quantity_usdc,
                 'quantity_btc': quantity_btc,
                 'buy_price_btc': buy_price,
-                'sell_price_btc': buy_params['sell_price'],
+                'sell_price_btc': buy_params.sell_price,
                 'buy_order_id': buy_order_id,
                 'market_type': market_type,
-                'offset_display': buy_params['offset_display']
+                'offset_display': buy_params.offset_display
             })
             
             self.logger.info(f"✅ Paire enregistrée dans BDD - Index: {pair_index}")
@@ -294,7 +366,7 @@ class BuyOrderManager:
                 'buy_order_id': buy_order_id,
                 'buy_price': buy_price,
                 'quantity_btc': quantity_btc,
-                'sell_price': buy_params['sell_price']
+                'sell_price': buy_params.sell_price
             }
             
         except Exception as e:
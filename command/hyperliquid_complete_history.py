@@ -15,10 +15,17 @@ from datetime import datetime
 import json
 import time
 import threading
+import traceback
 import os
 import sys
 from dotenv import load_dotenv
 
+# Sérialisation JSON rapide (optionnelle, repli sur json de la bibliothèque standard)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class HyperliquidHistoryService:
     """Service qui récupère périodiquement l'historique des ordres"""
@@ -50,6 +57,11 @@ class HyperliquidHistoryService:
         # État du service
         self.running = False
         self.thread = None
+        # Réveille la boucle avant la fin de l'attente (request_fetch() / stop())
+        self._wake_event = threading.Event()
+        # Une seule récupération à la fois: la boucle et fetch_now() partagent
+        # self.info, dont le timeout est modifié pendant la récupération
+        self._fetch_lock = threading.Lock()
         
         # Initialiser l'API Hyperliquid avec timeout
         self.info = Info(constants.MAINNET_API_URL, skip_ws=True)
@@ -95,6 +107,7 @@ class HyperliquidHistoryService:
         print("="*80)
         
         self.running = True
+        self._wake_event.clear()
         self.thread = threading.Thread(target=self._service_loop, daemon=True, name="HistoryService")
         self.thread.start()
         
@@ -109,6 +122,7 @@ class HyperliquidHistoryService:
         
         print("\n🛑 Arrêt du service...")
         self.running = False
+        self._wake_event.set()
         
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=5)
@@ -131,7 +145,7 @@ class HyperliquidHistoryService:
                 print(f"🔄 RÉCUPÉRATION HISTORIQUE - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
                 print("="*80)
                 
-                start_time = time.time()
+                start_time = time.monotonic()
                 
                 # Récupérer les données avec flags de succès
                 data, success_flags = self._fetch_complete_history()
@@ -143,7 +157,7 @@ class HyperliquidHistoryService:
                 # Exporter vers JSON (en préservant les anciens fichiers si échec)
                 self._export_to_json(data, success_flags)
                 
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
                 print(f"\n✅ Récupération terminée en {elapsed:.1f}s")
                 
                 # Afficher les warnings si certaines récupérations ont échoué
@@ -162,19 +176,17 @@ class HyperliquidHistoryService:
                 wait_seconds = self.check_interval_minutes * 60
                 print(f"\n⏳ Prochaine récupération dans {self.check_interval_minutes} minutes...")
                 
-                # Attendre par intervalles de 30s pour pouvoir arrêter proprement
-                elapsed_wait = 0
-                while elapsed_wait < wait_seconds and self.running:
-                    time.sleep(min(30, wait_seconds - elapsed_wait))
-                    elapsed_wait += 30
+                # Attente interrompue par stop() ou request_fetch()
+                self._wake_event.wait(wait_seconds)
+                self._wake_event.clear()
                 
             except Exception as e:
                 print(f"\n❌ Erreur dans le service: {e}")
-                import traceback
                 traceback.print_exc()
                 
-                # Attendre 60s avant de réessayer
-                time.sleep(60)
+                # Attendre 60s avant de réessayer (interrompu par stop())
+                self._wake_event.wait(60)
+                self._wake_event.clear()
     
     def _load_spot_metadata(self):
         """Charge les métadonnées des paires Spot"""
@@ -188,9 +200,24 @@ class HyperliquidHistoryService:
         print(f"   ✅ {len(self.spot_mapping)} paires chargées")
     
     def _fetch_complete_history(self):
+        """Récupère l'historique complet, une récupération à la fois
+        
+        Le timeout du client partagé est restauré même en cas d'exception.
+        Voir _fetch_complete_history_unlocked pour le format du résultat.
+        """
+        with self._fetch_lock:
+            original_timeout = self.info.timeout
+            try:
+                return self._fetch_complete_history_unlocked()
+            finally:
+                self.info.timeout = original_timeout
+    
+    def _fetch_complete_history_unlocked(self):
         """
         Récupère l'historique COMPLET des ordres avec timeout amélioré
         
+        À appeler via _fetch_complete_history (verrou + restauration du timeout).
+        
         Returns:
             tuple: (data_dict, success_flags_dict)
             - data_dict: {
@@ -225,20 +252,16 @@ class HyperliquidHistoryService:
             
             for attempt in range(max_retries):
                 try:
-                    # ✅ FIX: Créer un nouvel objet Info à chaque tentative
-                    info = Info(constants.MAINNET_API_URL, skip_ws=True)
+                    # Client partagé: connexions HTTP keep-alive réutilisées (pas de
+                    # nouveau handshake TLS ni d'appel spot_meta à chaque tentative)
+                    info = self.info
                     
                     # ✅ Timeout spécial pour ordres ouverts
-                    original_timeout = getattr(info, 'timeout', None)
                     info.timeout = TIMEOUT_OPEN_ORDERS
                     
                     print(f"   📡 Tentative {attempt + 1}/{max_retries} (timeout: {TIMEOUT_OPEN_ORDERS}s)...")
                     open_orders = info.open_orders(self.user_address)
                     
-                    # Restaurer timeout original
-                    if original_timeout is not None:
-                        info.timeout = original_timeout
-                    
                     # ✅ Succès - sortir de la boucle
                     success_flags['open_orders_success'] = True
                     break
@@ -274,8 +297,9 @@ class HyperliquidHistoryService:
             
             for attempt in range(max_retries):
                 try:
-                    # ✅ FIX: Créer un nouvel objet Info à chaque tentative
-                    info = Info(constants.MAINNET_API_URL, skip_ws=True)
+                    # Client partagé: connexions HTTP keep-alive réutilisées (pas de
+                    # nouveau handshake TLS ni d'appel spot_meta à chaque tentative)
+                    info = self.info
                     info.timeout = TIMEOUT_STANDARD
                     
                     historical_orders = info.post("/info", {
@@ -283,9 +307,6 @@ class HyperliquidHistoryService:
                         "user": self.user_address
                     })
                     
-                    if original_timeout is not None:
-                        info.timeout = original_timeout
-                    
                     # ✅ Succès
                     success_flags['historical_orders_success'] = True
                     break
@@ -317,15 +338,13 @@ class HyperliquidHistoryService:
             
             for attempt in range(max_retries):
                 try:
-                    # ✅ FIX: Créer un nouvel objet Info à chaque tentative
-                    info = Info(constants.MAINNET_API_URL, skip_ws=True)
+                    # Client partagé: connexions HTTP keep-alive réutilisées (pas de
+                    # nouveau handshake TLS ni d'appel spot_meta à chaque tentative)
+                    info = self.info
                     info.timeout = TIMEOUT_STANDARD
                     
                     fills = info.user_fills(self.user_address)
                     
-                    if original_timeout is not None:
-                        info.timeout = original_timeout
-                    
                     # ✅ Succès
                     success_flags['fills_success'] = True
                     break
@@ -362,7 +381,6 @@ class HyperliquidHistoryService:
             
         except Exception as e:
             print(f"❌ Erreur récupération historique: {e}")
-            import traceback
             traceback.print_exc()
             
             # En cas d'erreur, retourner des listes vides avec tous les flags à False
@@ -390,6 +408,26 @@ class HyperliquidHistoryService:
             else:
                 order['coin_name'] = coin
     
+    def _write_json(self, path, payload):
+        """Écrit un JSON de façon atomique (fichier temporaire puis os.replace)
+        
+        Le synchroniseur lit ces fichiers depuis un autre thread: il voit
+        l'ancienne ou la nouvelle version, jamais un fichier à moitié écrit.
+        """
+        # Temporaire propre au thread: la boucle et fetch_now() peuvent exporter en même temps
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        if orjson:
+            # UTF-8 natif (équivalent ensure_ascii=False), default=str comme json
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(
+                    payload, default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                ))
+        else:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+    
     def _export_to_json(self, data, success_flags):
         """
         Exporte les données dans 3 fichiers JSON dans /log
@@ -417,8 +455,7 @@ class HyperliquidHistoryService:
                     'fetch_success': True
                 }
                 
-                with open(open_orders_path, 'w', encoding='utf-8') as f:
-                    json.dump(open_orders_data, f, indent=2, ensure_ascii=False, default=str)
+                self._write_json(open_orders_path, open_orders_data)
                 
                 print(f"\n📄 {open_orders_path}")
                 print(f"   ✅ {len(data['open_orders'])} ordres ouverts")
@@ -439,8 +476,7 @@ class HyperliquidHistoryService:
                         old_data['last_failed_fetch'] = timestamp
                         old_data['fetch_success'] = False
                         
-                        with open(open_orders_path, 'w', encoding='utf-8') as f:
-                            json.dump(old_data, f, indent=2, ensure_ascii=False, default=str)
+                        self._write_json(open_orders_path, old_data)
                         
                         print(f"   ℹ️  Marqué comme potentiellement obsolète")
                     except Exception as e:
@@ -467,8 +503,7 @@ class HyperliquidHistoryService:
                 'fetch_success': success_flags.get('historical_orders_success', False) and success_flags.get('fills_success', False)
             }
             
-            with open(filled_orders_path, 'w', encoding='utf-8') as f:
-                json.dump(filled_orders_data, f, indent=2, ensure_ascii=False, default=str)
+            self._write_json(filled_orders_path, filled_orders_data)
             
             print(f"\n📄 {filled_orders_path}")
             print(f"   ✅ {len(filled_orders)} ordres exécutés")
@@ -491,17 +526,25 @@ class HyperliquidHistoryService:
                 'fetch_success': success_flags.get('historical_orders_success', False)
             }
             
-            with open(historic_path, 'w', encoding='utf-8') as f:
-                json.dump(historic_data, f, indent=2, ensure_ascii=False, default=str)
+            self._write_json(historic_path, historic_data)
             
             print(f"\n📄 {historic_path}")
             print(f"   ✅ {len(data['historical_orders'])} ordres (tous statuts)")
             
         except Exception as e:
             print(f"\n❌ Erreur export JSON: {e}")
-            import traceback
             traceback.print_exc()
     
+    def request_fetch(self):
+        """Demande une récupération immédiate au thread du service (non bloquant)
+        
+        Sans thread actif, la récupération est faite dans l'appelant (fetch_now).
+        """
+        if self.running and self.thread and self.thread.is_alive():
+            self._wake_event.set()
+            return True
+        return self.fetch_now()
+    
     def fetch_now(self):
         """Force une récupération immédiate (pour tests)"""
         print("\n🔄 Récupération forcée...")
@@ -529,7 +572,6 @@ class HyperliquidHistoryService:
         except Exception as e:
             print(f"\n❌ Erreur: {e}")
             print("   Vérifiez votre connexion à api.hyperliquid.xyz")
-            import traceback
             traceback.print_exc()
             return False
     
@@ -561,7 +603,6 @@ def main():
         
     except Exception as e:
         print(f"\n❌ Erreur fatale: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
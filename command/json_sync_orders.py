@@ -15,11 +15,17 @@ import os
 import time
 import threading
 from datetime import datetime, timezone
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Set
 from config import TradingConfig
 from DB.database import Database
 from command.logger import TradingLogger
 
+# Parser JSON rapide (optionnel, repli sur json de la bibliothèque standard)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class JsonOrderSynchronizer:
     """Synchronise les ordres en lisant les fichiers JSON"""
@@ -40,6 +46,12 @@ class JsonOrderSynchronizer:
         # État
         self.running = False
         self.thread = None
+        # Réveille la boucle immédiatement à l'arrêt (au lieu d'attendre sync_interval)
+        self._stop_event = threading.Event()
+        
+        # Synchronisation en cours: la boucle et force_sync() ne se chevauchent pas
+        # (acquire non bloquant = simple drapeau test-and-set atomique)
+        self._sync_guard = threading.Lock()
         
         # Intervalle de synchronisation (en secondes)
         # On vérifie toutes les minutes si les JSON ont été mis à jour
@@ -53,6 +65,10 @@ class JsonOrderSynchronizer:
         self.logger.info("🔄 [JSON SYNC] Module de synchronisation JSON initialisé")
         self.logger.info(f"   Dossier JSON: {self.json_dir}/")
     
+    def on_config_reload(self, config: TradingConfig):
+        """Applique une configuration rechargée (notifications Telegram)"""
+        self.config = config
+    
     def start(self):
         """Démarre le thread de synchronisation"""
         if self.running:
@@ -60,6 +76,7 @@ class JsonOrderSynchronizer:
             return
         
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._sync_loop, daemon=True, name="JsonSyncThread")
         self.thread.start()
         self.logger.info("✅ Thread de synchronisation JSON démarré")
@@ -71,6 +88,7 @@ class JsonOrderSynchronizer:
         
         self.logger.info("🛑 Arrêt du thread de synchronisation JSON...")
         self.running = False
+        self._stop_event.set()
         
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=5)
@@ -88,23 +106,23 @@ class JsonOrderSynchronizer:
                     self.logger.info(f"\n{'='*60}")
                     self.logger.info("🔄 Nouveaux JSON détectés - Synchronisation...")
                     
-                    start_time = time.time()
+                    start_time = time.monotonic()
                     
                     # Synchroniser les ordres
                     self._sync_orders()
                     
-                    elapsed = time.time() - start_time
+                    elapsed = time.monotonic() - start_time
                     self.logger.info(f"✅ Synchronisation terminée ({elapsed:.1f}s)")
                     self.logger.info(f"{'='*60}")
                 
-                # Attendre avant la prochaine vérification
-                time.sleep(self.sync_interval)
+                # Attendre avant la prochaine vérification (interrompu par stop())
+                if self._stop_event.wait(self.sync_interval):
+                    break
                 
             except Exception as e:
-                self.logger.error(f"❌ Erreur dans boucle de synchronisation: {e}")
-                import traceback
-                traceback.print_exc()
-                time.sleep(60)
+                self.logger.exception(f"❌ Erreur dans boucle de synchronisation: {e}")
+                if self._stop_event.wait(60):
+                    break
         
         self.logger.info("🔚 Boucle de synchronisation JSON terminée")
     
@@ -155,8 +173,12 @@ class JsonOrderSynchronizer:
                 self.logger.warning(f"⚠️  Fichier non trouvé: {filepath}")
                 return None
             
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if orjson:
+                with open(filepath, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
             
             return data
             
@@ -164,66 +186,113 @@ class JsonOrderSynchronizer:
             self.logger.error(f"❌ Erreur lecture {filepath}: {e}")
             return None
     
-    def _sync_orders(self):
-        """Synchronise tous les ordres actifs depuis les JSON"""
-        # Charger les JSON
-        open_orders_data = self._load_json(self.open_orders_file)
-        filled_orders_data = self._load_json(self.filled_orders_file)
-        historic_data = self._load_json(self.historic_file)
-        
-        if not open_orders_data or not filled_orders_data or not historic_data:
-            self.logger.error("❌ Impossible de charger tous les JSON")
-            return
+    def _sync_orders(self) -> bool:
+        """Synchronise tous les ordres actifs depuis les JSON
         
-        # Synchroniser les ordres d'achat et de vente
-        self._check_buy_orders(open_orders_data, filled_orders_data)
-        self._check_sell_orders(open_orders_data, filled_orders_data)
+        Returns:
+            bool: False si les JSON sont illisibles ou si une synchronisation
+                  est déjà en cours dans un autre thread
+        """
+        if not self._sync_guard.acquire(blocking=False):
+            self.logger.info("⏭️  Synchronisation déjà en cours - ignorée")
+            return False
+        
+        try:
+            # Paires Buy et Sell en une seule requête (avant tout parsing JSON)
+            pending = self.database.get_pending_pairs()
+            if not pending['Buy'] and not pending['Sell']:
+                self.logger.debug("⏭️  Aucune paire en attente - JSON non chargés")
+                return True
+            
+            # Charger les JSON
+            open_orders_data = self._load_json(self.open_orders_file)
+            filled_orders_data = self._load_json(self.filled_orders_file)
+            # historic.json (historique complet, le plus gros) n'est pas utilisé par
+            # la synchronisation: on vérifie sa présence sans le parser
+            historic_present = os.path.exists(self.historic_file)
+            
+            if not open_orders_data or not filled_orders_data or not historic_present:
+                self.logger.error("❌ Impossible de charger tous les JSON")
+                return False
+            
+            # Index construits une fois par synchronisation (lookup O(1) par paire)
+            open_order_ids, fills_map = self._build_order_maps(open_orders_data, filled_orders_data)
+            
+            # Synchroniser les ordres d'achat et de vente
+            self._check_buy_orders(open_order_ids, fills_map, pending['Buy'])
+            self._check_sell_orders(open_order_ids, fills_map, pending['Sell'])
+            return True
+        finally:
+            self._sync_guard.release()
     
-    def _get_order_status_from_json(self, order_id: str, open_orders_data: Dict, 
-                                     filled_orders_data: Dict) -> Dict:
+    def _build_order_maps(self, open_orders_data: Dict, filled_orders_data: Dict):
         """
-        Récupère le statut d'un ordre depuis les JSON
+        Indexe les JSON par order ID
         
         Args:
-            order_id: ID de l'ordre
             open_orders_data: Données de open_orders.json
             filled_orders_data: Données de filled_orders.json
             
+        Returns:
+            tuple: (open_order_ids {oid}, fills_map {oid: (quantité totale, dernier fill)})
+        """
+        # Seule l'existence d'un ordre ouvert compte pour la synchronisation
+        # IDs normalisés en str ici, une fois: la BDD les stocke déjà en String
+        open_order_ids = {
+            str(order['oid'] if 'oid' in order else order.get('id'))
+            for order in open_orders_data.get('orders', [])
+        }
+        
+        # Cumul des fills par ordre (un ordre peut être rempli en plusieurs fois)
+        fills_map = {}
+        for fill in filled_orders_data.get('fills_details', []):
+            oid = str(fill.get('oid'))
+            total_filled, latest_fill_time = fills_map.get(oid, (0.0, 0))
+            fills_map[oid] = (
+                total_filled + float(fill.get('sz', 0)),
+                max(latest_fill_time, fill.get('time', 0))
+            )
+        
+        self.logger.info(
+            f"📊 JSON indexés: {len(open_order_ids)} ordre(s) ouvert(s), "
+            f"{len(fills_map)} ordre(s) rempli(s)"
+        )
+        return open_order_ids, fills_map
+    
+    def _get_order_status_from_json(self, order_id: str, open_order_ids: Set,
+                                     fills_map: Dict) -> Dict:
+        """
+        Récupère le statut d'un ordre depuis les JSON indexés
+        
+        Args:
+            order_id: ID de l'ordre (str, comme en BDD et dans les index)
+            open_order_ids: IDs des ordres ouverts (voir _build_order_maps)
+            fills_map: Fills cumulés par ID (voir _build_order_maps)
+            
         Returns:
             dict: {
                 'status': 'open' | 'filled' | 'unknown',
                 'timestamp': int,
-                'size': float,
+                'size': float,   # quantité remplie (0 si non rempli)
                 'source': str
             }
         """
         try:
             # 1. Vérifier si l'ordre est OUVERT
-            for order in open_orders_data.get('orders', []):
-                if str(order.get('oid', order.get('id'))) == str(order_id):
-                    self.logger.info(f"📊 Order ID {order_id} - Status: OPEN")
-                    return {
-                        'status': 'open',
-                        'timestamp': order.get('timestamp', int(time.time() * 1000)),
-                        'size': float(order.get('sz', order.get('amount', 0))),
-                        'source': 'open_orders_json'
-                    }
+            if order_id in open_order_ids:
+                self.logger.debug("📊 Order ID %s - Status: OPEN", order_id)
+                return {
+                    'status': 'open',
+                    'timestamp': 0,
+                    'size': 0,
+                    'source': 'open_orders_json'
+                }
             
             # 2. Vérifier si l'ordre est REMPLI
-            # Calculer la quantité totale remplie depuis fills_details
-            total_filled = 0.0
-            latest_fill_time = 0
-            
-            for fill in filled_orders_data.get('fills_details', []):
-                if str(fill.get('oid')) == str(order_id):
-                    total_filled += float(fill.get('sz', 0))
-                    fill_time = fill.get('time', 0)
-                    if fill_time > latest_fill_time:
-                        latest_fill_time = fill_time
+            total_filled, latest_fill_time = fills_map.get(order_id, (0.0, 0))
             
             if total_filled > 0:
-                self.logger.info(f"📊 Order ID {order_id} - Status: FILLED")
-                self.logger.info(f"   Quantité totale: {total_filled:.8f}")
+                self.logger.debug("📊 Order ID %s - Status: FILLED (%.8f)", order_id, total_filled)
                 return {
                     'status': 'filled',
                     'timestamp': latest_fill_time,
@@ -241,9 +310,7 @@ class JsonOrderSynchronizer:
             }
             
         except Exception as e:
-            self.logger.error(f"❌ Erreur _get_order_status_from_json: {e}")
-            import traceback
-            traceback.print_exc()
+            self.logger.exception(f"❌ Erreur _get_order_status_from_json: {e}")
             return {
                 'status': 'unknown',
                 'timestamp': 0,
@@ -251,33 +318,36 @@ class JsonOrderSynchronizer:
                 'source': 'error'
             }
     
-    def _check_buy_orders(self, open_orders_data: Dict, filled_orders_data: Dict):
+    def _check_buy_orders(self, open_order_ids: Set, fills_map: Dict, buy_pairs: List):
         """
         Vérifie les ordres d'achat
         ✅ CORRECTION: Met à jour la quantité BTC réelle après fill
-        """
-        # Récupérer les paires en attente d'achat
-        buy_pairs = self.database.get_pairs_by_status('Buy')
         
+        Args:
+            buy_pairs: Paires en attente d'achat (status='Buy')
+        """        
         if not buy_pairs:
             return
         
         self.logger.info(f"📊 {len(buy_pairs)} paire(s) en attente d'achat dans BDD")
         
+        # Fills collectés puis appliqués en une seule transaction après la boucle
+        filled = {}
+        
         for pair in buy_pairs:
             try:
-                buy_order_id = str(pair.buy_order_id)
+                buy_order_id = pair.buy_order_id
                 
                 # Récupérer le statut depuis les JSON
                 order_status = self._get_order_status_from_json(
-                    buy_order_id, open_orders_data, filled_orders_data
+                    buy_order_id, open_order_ids, fills_map
                 )
                 
                 status = order_status['status']
                 
                 if status == 'open':
                     # Ordre encore ouvert - RAS
-                    self.logger.info(f"⏳ Ordre d'achat {buy_order_id} - Toujours OUVERT")
+                    self.logger.debug("⏳ Ordre d'achat %s - Toujours OUVERT", buy_order_id)
                     
                 elif status == 'filled':
                     # Ordre rempli - Passer en mode Sell
@@ -287,43 +357,59 @@ class JsonOrderSynchronizer:
                     self.logger.info(f"   Quantité calculée: {pair.quantity_btc:.8f} BTC")
                     self.logger.info(f"   Quantité réelle: {total_filled:.8f} BTC")
                     
-                    # 1️⃣ Mettre à jour la quantité BTC réelle
-                    self.database.update_quantity_btc(pair.index, total_filled)
-                    
-                    # 2️⃣ Mettre à jour le statut
-                    self.database.update_pair_status(pair.index, 'Sell')
-                    self.logger.info(f"✅ Paire {pair.index} - Status mis à jour: Buy -> Sell")
-                    
-                    # Notification Telegram
-                    if self.telegram and self.config.telegram_on_order_filled:
-                        try:
-                            self.telegram.send_buy_order_filled(
-                                order_id=buy_order_id,
-                                price=pair.buy_price_btc,
-                                size=total_filled
-                            )
-                        except Exception as e:
-                            self.logger.error(f"❌ Erreur notification: {e}")
+                    filled[pair.index] = (pair, buy_order_id, total_filled)
                 
                 else:  # unknown
                     self.logger.warning(f"❓ Ordre d'achat {buy_order_id} - Statut INCONNU")
                     self.logger.warning(f"   Vérification manuelle recommandée pour paire {pair.index}")
                 
             except Exception as e:
-                self.logger.error(f"❌ Erreur vérification paire {pair.index}: {e}")
-                import traceback
-                traceback.print_exc()
+                self.logger.exception(f"❌ Erreur vérification paire {pair.index}: {e}")
+        
+        if filled:
+            self._apply_buy_fills(filled)
     
-    def _check_sell_orders(self, open_orders_data: Dict, filled_orders_data: Dict):
-        """Vérifie les ordres de vente"""
-        # Récupérer les paires en attente de vente
-        sell_pairs = self.database.get_pairs_by_status('Sell')
+    def _apply_buy_fills(self, filled: Dict):
+        """
+        Passe en Sell les paires dont l'achat est rempli (quantité réelle + statut)
         
+        Args:
+            filled: {index: (paire, buy_order_id, quantité remplie)}
+        """
+        updated = self.database.update_buy_filled_bulk(
+            {index: total_filled for index, (_, _, total_filled) in filled.items()}
+        )
+        self.logger.info(f"✅ {updated} paire(s) - Status mis à jour: Buy -> Sell")
+        if updated < len(filled):
+            self.logger.warning(f"⚠️  {len(filled) - updated} paire(s) non mise(s) à jour (déjà traitée(s) ?)")
+        
+        # Notifications Telegram
+        if self.telegram and self.config.telegram_on_order_filled:
+            for pair, buy_order_id, total_filled in filled.values():
+                try:
+                    self.telegram.send_buy_order_filled(
+                        order_id=buy_order_id,
+                        price=pair.buy_price_btc,
+                        size=total_filled
+                    )
+                except Exception as e:
+                    self.logger.error(f"❌ Erreur notification: {e}")
+    
+    def _check_sell_orders(self, open_order_ids: Set, fills_map: Dict, sell_pairs: List):
+        """
+        Vérifie les ordres de vente
+        
+        Args:
+            sell_pairs: Paires en attente de vente (status='Sell')
+        """        
         if not sell_pairs:
             return
         
         self.logger.info(f"📊 {len(sell_pairs)} paire(s) en attente de vente dans BDD")
         
+        # Ventes remplies collectées puis complétées en un seul UPDATE après la boucle
+        filled = {}
+        
         for pair in sell_pairs:
             try:
                 sell_order_id = getattr(pair, 'sell_order_id', None)
@@ -332,18 +418,16 @@ class JsonOrderSynchronizer:
                     # Ordre de vente pas encore placé
                     continue
                 
-                sell_order_id = str(sell_order_id)
-                
                 # Récupérer le statut depuis les JSON
                 order_status = self._get_order_status_from_json(
-                    sell_order_id, open_orders_data, filled_orders_data
+                    sell_order_id, open_order_ids, fills_map
                 )
                 
                 status = order_status['status']
                 
                 if status == 'open':
                     # Ordre encore ouvert - RAS
-                    self.logger.info(f"⏳ Ordre de vente {sell_order_id} - Toujours OUVERT")
+                    self.logger.debug("⏳ Ordre de vente %s - Toujours OUVERT", sell_order_id)
                     
                 elif status == 'filled':
                     # Ordre rempli - Cycle complété
@@ -354,33 +438,7 @@ class JsonOrderSynchronizer:
                         self.logger.info(f"✅ Ordre de vente {sell_order_id} REMPLI")
                         self.logger.info(f"   Quantité: {total_filled:.8f} BTC")
                         
-                        # ✅ CORRECTION: Utiliser complete_pair() pour calculer ET enregistrer les gains
-                        success = self.database.complete_pair(pair.index, pair.sell_price_btc)
-                        
-                        if success:
-                            self.logger.info(f"✅ Paire {pair.index} - Cycle complété avec gains calculés")
-                            
-                            # Récupérer la paire mise à jour pour avoir les gains
-                            updated_pair = self.database.get_pair_by_index(pair.index)
-                            
-                            if updated_pair:
-                                # Notification Telegram avec les vrais gains de la BDD
-                                if self.telegram and self.config.telegram_on_order_filled:
-                                    try:
-                                        self.telegram.send_sell_order_filled(
-                                            order_id=sell_order_id,
-                                            price=pair.sell_price_btc,
-                                            size=total_filled,
-                                            buy_price=pair.buy_price_btc,
-                                            profit=updated_pair.gain_usdc,
-                                            profit_percent=updated_pair.gain_percent
-                                        )
-                                    except Exception as e:
-                                        self.logger.error(f"❌ Erreur notification: {e}")
-                        else:
-                            self.logger.error(f"❌ Échec complete_pair pour paire {pair.index}")
-                            # Fallback: juste changer le statut sans calculer les gains
-                            self.database.update_pair_status(pair.index, 'Complete')
+                        filled[pair.index] = (pair, sell_order_id, total_filled)
                     else:
                         self.logger.warning(f"⚠️  Ordre {sell_order_id} partiellement rempli")
                         self.logger.warning(f"   Attendu: {pair.quantity_btc:.8f}, Rempli: {total_filled:.8f}")
@@ -390,9 +448,44 @@ class JsonOrderSynchronizer:
                     self.logger.warning(f"   Vérification manuelle recommandée pour paire {pair.index}")
                 
             except Exception as e:
-                self.logger.error(f"❌ Erreur vérification paire {pair.index}: {e}")
-                import traceback
-                traceback.print_exc()
+                self.logger.exception(f"❌ Erreur vérification paire {pair.index}: {e}")
+        
+        if filled:
+            self._apply_sell_fills(filled)
+    
+    def _apply_sell_fills(self, filled: Dict):
+        """
+        Complète les paires dont la vente est remplie et calcule les gains
+        
+        Args:
+            filled: {index: (paire, sell_order_id, quantité remplie)}
+        """
+        # ✅ CORRECTION: gains calculés ET enregistrés par la BDD (prix de vente de la paire)
+        gains = self.database.complete_order_pairs_bulk(list(filled))
+        
+        for index, (pair, sell_order_id, total_filled) in filled.items():
+            if index not in gains:
+                self.logger.error(f"❌ Échec complete_pair pour paire {index}")
+                # Fallback: juste changer le statut sans calculer les gains
+                self.database.update_pair_status(index, 'Complete')
+                continue
+            
+            self.logger.info(f"✅ Paire {index} - Cycle complété avec gains calculés")
+            
+            # Notification Telegram avec les vrais gains de la BDD
+            if self.telegram and self.config.telegram_on_order_filled:
+                gain_usdc, gain_percent = gains[index]
+                try:
+                    self.telegram.send_sell_order_filled(
+                        order_id=sell_order_id,
+                        price=pair.sell_price_btc,
+                        size=total_filled,
+                        buy_price=pair.buy_price_btc,
+                        profit=gain_usdc,
+                        profit_percent=gain_percent
+                    )
+                except Exception as e:
+                    self.logger.error(f"❌ Erreur notification: {e}")
     
     def force_sync(self):
         """Force une synchronisation immédiate (pour debug)"""
@@ -403,19 +496,9 @@ class JsonOrderSynchronizer:
             self.last_filled_mtime = 0
             self.last_historic_mtime = 0
             
-            # Charger et synchroniser
-            open_orders_data = self._load_json(self.open_orders_file)
-            filled_orders_data = self._load_json(self.filled_orders_file)
-            historic_data = self._load_json(self.historic_file)
-            
-            if open_orders_data and filled_orders_data and historic_data:
-                self._check_buy_orders(open_orders_data, filled_orders_data)
-                self._check_sell_orders(open_orders_data, filled_orders_data)
+            # Charger et synchroniser (ignoré si la boucle synchronise déjà)
+            if self._sync_orders():
                 self.logger.info("✅ Synchronisation forcée terminée")
-            else:
-                self.logger.error("❌ Impossible de charger les JSON")
                 
         except Exception as e:
-            self.logger.error(f"❌ Erreur synchronisation forcée: {e}")
-            import traceback
-            traceback.print_exc()
+            self.logger.exception(f"❌ Erreur synchronisation forcée: {e}")
@@ -1,9 +1,32 @@
+import atexit
 import logging
+import queue
 import sys
 import os
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from config import TradingConfig
 
+# Séparateur des bannières de log (construit une seule fois)
+BANNER = "=" * 60
+
+
+class _BatchFlushFileHandler(logging.FileHandler):
+    """FileHandler qui ne vide son buffer que lorsque la file de logs est vide
+    
+    Une rafale d'enregistrements est écrite par blocs (buffer du fichier)
+    au lieu d'un appel système write/flush par ligne.
+    """
+    
+    def __init__(self, filename, log_queue, encoding=None):
+        super().__init__(filename, encoding=encoding)
+        self._log_queue = log_queue
+    
+    def flush(self):
+        if self._log_queue.empty():
+            super().flush()
+
+
 class TradingLogger:
     """Gestion des logs pour le bot de trading"""
     
@@ -33,9 +56,14 @@ class TradingLogger:
             os.makedirs(log_dir, exist_ok=True)
             print(f"📁 Dossier créé: {log_dir}")
         
-        # Handler pour fichier avec encodage UTF-8
-        file_handler = logging.FileHandler(
+        # Les handlers (I/O fichier et console) tournent dans le thread du
+        # QueueListener: l'appelant se contente d'empiler l'enregistrement
+        log_queue = queue.SimpleQueue()
+        
+        # Handler pour fichier avec encodage UTF-8 (flush groupé par rafale)
+        file_handler = _BatchFlushFileHandler(
             self.config.log_file, 
+            log_queue,
             encoding='utf-8'
         )
         file_handler.setLevel(logging.INFO)
@@ -50,23 +78,35 @@ class TradingLogger:
         if sys.platform == 'win32':
             try:
                 # Essayer de configurer UTF-8 pour Windows
-                sys.stdout.reconfigure(encoding='utf-8')
+                # errors='replace': l'écriture se fait dans le thread du QueueListener,
+                # hors de portée du fallback de _safe_log
+                sys.stdout.reconfigure(encoding='utf-8', errors='replace')
             except:
                 pass
         
-        # Ajouter les handlers
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        listener = QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(listener.stop)
+        
+        self.logger.addHandler(QueueHandler(log_queue))
         
         # Empêcher la propagation aux loggers parents pour éviter les doublons
         self.logger.propagate = False
     
-    def _safe_log(self, level, message: str):
-        """Log avec gestion robuste des caracteres speciaux"""
+    def _safe_log(self, level, message: str, *args):
+        """Log avec gestion robuste des caracteres speciaux
+        
+        args: arguments %-style, interpolés par logging seulement si
+        l'enregistrement passe le niveau du logger (ex: debug filtré)
+        """
         try:
             # Essayer de logger normalement
-            getattr(self.logger, level)(message)
+            getattr(self.logger, level)(message, *args)
         except (UnicodeEncodeError, UnicodeDecodeError):
+            if args:
+                message = message % args
             # En cas d'erreur, remplacer les emojis par du texte
             emoji_replacements = {
                 '⏳': '[WAIT]',
@@ -97,21 +137,34 @@ class TradingLogger:
             safe_message = safe_message.encode('ascii', 'replace').decode('ascii')
             getattr(self.logger, level)(safe_message)
     
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """Log une information"""
-        self._safe_log('info', message)
+        self._safe_log('info', message, *args)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """Log un avertissement"""
-        self._safe_log('warning', message)
+        self._safe_log('warning', message, *args)
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """Log une erreur"""
-        self._safe_log('error', message)
+        self._safe_log('error', message, *args)
     
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """Log un message de debug"""
-        self._safe_log('debug', message)
+        self._safe_log('debug', message, *args)
+    
+    def exception(self, message: str, *args):
+        """Log une erreur avec la trace de l'exception en cours (à appeler dans un except)
+        
+        La trace passe par les handlers du logger (thread du QueueListener)
+        au lieu d'une écriture synchrone sur stderr (traceback.print_exc).
+        """
+        self._safe_log('exception', message, *args)
+    
+    def banner(self, title: str, newline_before: bool = False):
+        """Log un titre encadré par deux séparateurs, en un seul enregistrement"""
+        prefix = "\n" if newline_before else ""
+        self._safe_log('info', f"{prefix}{BANNER}\n{title}\n{BANNER}")
     
     def log_market_analysis(self, analysis: dict):
         """Log l'analyse du marche"""
@@ -155,15 +208,13 @@ class TradingLogger:
     
     def log_bot_start(self):
         """Log le demarrage du bot"""
-        self.info("=" * 60)
-        self.info("BOT DE TRADING HYPERLIQUID - DEMARRAGE")
-        self.info(f"Symbole: {self.config.symbol}")
-        self.info(f"Intervalle: {self.config.interval}")
-        self.info(f"Testnet: {self.config.testnet}")
-        self.info("=" * 60)
+        self.banner(
+            "BOT DE TRADING HYPERLIQUID - DEMARRAGE\n"
+            f"Symbole: {self.config.symbol}\n"
+            f"Intervalle: {self.config.interval}\n"
+            f"Testnet: {self.config.testnet}"
+        )
     
     def log_bot_stop(self):
         """Log l'arrêt du bot"""
-        self.info("=" * 60)
-        self.info("BOT DE TRADING HYPERLIQUID - ARRET")
-        self.info("=" * 60)
+        self.banner("BOT DE TRADING HYPERLIQUID - ARRET")
@@ -1,3 +1,5 @@
+import time
+import threading
 import requests
 import numpy as np
 from typing import Dict, List, Tuple
@@ -8,10 +10,25 @@ from command.logger import TradingLogger
 class MarketAnalyzer:
     """Analyse le marche avec les moyennes mobiles et detection de range dynamique"""
     
+    ANALYSIS_CACHE_TTL = 10.0  # Durée (s) de partage d'une analyse entre appelants
+    
     def __init__(self, config: TradingConfig):
         self.config = config
         self.base_url = config.base_url
         self.logger = TradingLogger(config)
+        # Session HTTP réutilisée (keep-alive) entre deux analyses
+        self.session = requests.Session()
+        self.session.headers.update({'Content-Type': 'application/json'})
+        # Dernière analyse réussie: (time.monotonic() du calcul, résultat)
+        self._analysis_cache = (0.0, None)
+        self._analysis_lock = threading.Lock()
+    
+    def on_config_reload(self, config: TradingConfig):
+        """Applique une configuration rechargée (URL de base incluse)"""
+        self.config = config
+        self.base_url = config.base_url
+        # Symbole, intervalle ou périodes MA ont pu changer
+        self._analysis_cache = (0.0, None)
     
     def get_candles(self) -> List[Dict]:
         """Recupere les donnees de chandeliers depuis l'API Hyperliquid"""
@@ -28,7 +45,7 @@ class MarketAnalyzer:
         }
         
         try:
-            response = requests.post(url, json=payload, headers={'Content-Type': 'application/json'})
+            response = self.session.post(url, json=payload)
             response.raise_for_status()
             data = response.json()
             
@@ -130,6 +147,27 @@ class MarketAnalyzer:
             'mid': mid
         }
     
+    def analyze_market_cached(self, max_age: float = ANALYSIS_CACHE_TTL) -> Dict:
+        """Analyse du marché partagée entre appelants rapprochés (dashboard, achats)
+        
+        Args:
+            max_age: Âge max (s) d'une analyse en cache réutilisable
+        """
+        # Lecture sans verrou du dernier résultat publié (tuple remplacé d'un bloc)
+        computed_at, cached = self._analysis_cache
+        if cached is not None and time.monotonic() - computed_at < max_age:
+            return dict(cached)
+        
+        with self._analysis_lock:
+            computed_at, cached = self._analysis_cache
+            if cached is not None and time.monotonic() - computed_at < max_age:
+                return dict(cached)
+            
+            analysis = self.analyze_market()
+            if 'error' not in analysis:
+                self._analysis_cache = (time.monotonic(), analysis)
+            return dict(analysis)
+    
     def analyze_market(self) -> Dict:
         """Analyse le marche et determine le type de marche"""
         candles = self.get_candles()
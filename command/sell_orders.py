@@ -8,14 +8,13 @@ Logique: Surveiller ordres d'achat exécutés -> Placer ordre -> Surveiller exé
 - Mode spot limit: ordres maker uniquement, pas besoin d'ajuster pour les frais de vente
 """
 
-import time
 import threading
 from datetime import datetime, timezone
 from typing import Dict, Optional
 from config import TradingConfig
 from DB.database import Database
 from command.trading_engine import TradingEngine
-from command.logger import TradingLogger
+from command.logger import TradingLogger, BANNER
 
 
 class SellOrderManager:
@@ -47,6 +46,8 @@ class SellOrderManager:
         # État
         self.running = False
         self.thread = None
+        # Réveille la boucle immédiatement à l'arrêt (au lieu de finir la pause)
+        self._stop_event = threading.Event()
         
         # Cache pour éviter les vérifications répétées
         self.failed_pairs = {}  # {pair_index: timestamp_dernier_echec}
@@ -54,6 +55,10 @@ class SellOrderManager:
         
         self.logger.info("🔵 [SELL ORDERS] Module initialisé")
     
+    def on_config_reload(self, config: TradingConfig):
+        """Applique une configuration rechargée (lue au prochain tour de boucle)"""
+        self.config = config
+    
     def start(self):
         """Démarre le thread de vente (1 SEUL THREAD)"""
         if self.running:
@@ -61,6 +66,7 @@ class SellOrderManager:
             return
         
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._sell_loop, daemon=True, name="SellThread")
         self.thread.start()
         self.logger.info("✅ Thread de vente démarré")
@@ -72,6 +78,7 @@ class SellOrderManager:
         
         self.logger.info("🛑 Arrêt du thread de vente...")
         self.running = False
+        self._stop_event.set()
         
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=5)
@@ -88,8 +95,9 @@ class SellOrderManager:
                 active_pairs = self._get_active_pairs()
                 
                 if not active_pairs:
-                    # Aucune paire active, attendre avant de revérifier
-                    time.sleep(30)
+                    # Aucune paire active, attendre avant de revérifier (interrompu par stop())
+                    if self._stop_event.wait(30):
+                        break
                     continue
                 
                 # 2. Traiter chaque paire avec un délai entre chaque traitement
@@ -99,22 +107,21 @@ class SellOrderManager:
                         
                         # ⚠️ IMPORTANT : Attendre 2 secondes entre chaque paire
                         # pour éviter de saturer l'API et déclencher le circuit breaker
-                        time.sleep(2)
+                        if self._stop_event.wait(2):
+                            break
                         
                     except Exception as e:
                         pair_index = getattr(pair, 'index', 'UNKNOWN')
-                        self.logger.error(f"❌ Erreur traitement paire {pair_index}: {e}")
-                        import traceback
-                        traceback.print_exc()
+                        self.logger.exception(f"❌ Erreur traitement paire {pair_index}: {e}")
                 
-                # 3. Attendre avant la prochaine vérification
-                time.sleep(30)  # Vérifier toutes les 30 secondes
+                # 3. Attendre avant la prochaine vérification (interrompu par stop())
+                if self._stop_event.wait(30):  # Vérifier toutes les 30 secondes
+                    break
                 
             except Exception as e:
-                self.logger.error(f"❌ Erreur dans boucle de vente: {e}")
-                import traceback
-                traceback.print_exc()
-                time.sleep(30)
+                self.logger.exception(f"❌ Erreur dans boucle de vente: {e}")
+                if self._stop_event.wait(30):
+                    break
         
         self.logger.info("🔚 Boucle de vente terminée")
     
@@ -190,11 +197,10 @@ class SellOrderManager:
         # ✅ VÉRIFICATION CRITIQUE : Vérifier le solde BTC disponible
         available_btc = self.trading_engine.get_balance("BTC", available_only=True)
         
-        self.logger.info(f"\n{'='*60}")
-        self.logger.info(f"🔵 VÉRIFICATION PAIRE {pair_index}")
-        self.logger.info(f"{'='*60}")
-        self.logger.info(f"   Quantité BTC requise: {quantity_btc:.8f} BTC")
-        self.logger.info(f"   Solde BTC disponible: {available_btc:.8f} BTC")
+        # Vérification répétée à chaque passage de la boucle: détail en debug
+        self.logger.debug("🔵 VÉRIFICATION PAIRE %s", pair_index)
+        self.logger.debug("   Quantité BTC requise: %.8f BTC", quantity_btc)
+        self.logger.debug("   Solde BTC disponible: %.8f BTC", available_btc)
         
         # Vérifier avec une tolérance de 0.1% pour les arrondis
         if available_btc < quantity_btc * 0.999:
@@ -204,7 +210,7 @@ class SellOrderManager:
             self.logger.warning(f"   Réessai dans {self.retry_delay} secondes")
             return False
         
-        self.logger.info(f"✅ Solde suffisant ({available_btc:.8f} >= {quantity_btc:.8f})")
+        self.logger.debug("✅ Solde suffisant (%.8f >= %.8f)", available_btc, quantity_btc)
         
         # Vérifier que la quantité est valide
         if quantity_btc <= 0:
@@ -217,17 +223,20 @@ class SellOrderManager:
             self.logger.error(f"❌ Valeur trop faible: {order_value:.2f}$ < {self.config.min_order_value_usdc}$")
             return False
         
-        self.logger.info(f"\n{'='*60}")
-        self.logger.info(f"🔵 PLACEMENT ORDRE DE VENTE")
-        self.logger.info(f"{'='*60}")
-        self.logger.info(f"   Paire: {pair_index}")
-        self.logger.info(f"   Ordre d'achat: {buy_order_id}")
-        self.logger.info(f"   Marché: {market_type}")
-        self.logger.info(f"   Prix vente: {sell_price:.2f}$")
-        self.logger.info(f"   Quantité: {quantity_btc:.8f} BTC (quantité RÉELLE)")
-        self.logger.info(f"   Valeur estimée: {order_value:.2f} USDC")
-        self.logger.info(f"   Note: Frais maker seront déduits du montant USDC reçu")
-        self.logger.info(f"{'='*60}")
+        # Récapitulatif en un seul enregistrement de log
+        self.logger.info(
+            f"\n{BANNER}\n"
+            f"🔵 PLACEMENT ORDRE DE VENTE\n"
+            f"{BANNER}\n"
+            f"   Paire: {pair_index}\n"
+            f"   Ordre d'achat: {buy_order_id}\n"
+            f"   Marché: {market_type}\n"
+            f"   Prix vente: {sell_price:.2f}$\n"
+            f"   Quantité: {quantity_btc:.8f} BTC (quantité RÉELLE)\n"
+            f"   Valeur estimée: {order_value:.2f} USDC\n"
+            f"   Note: Frais maker seront déduits du montant USDC reçu\n"
+            f"{BANNER}"
+        )
         
         # Placer l'ordre via le trading engine
         order_result = self.trading_engine.execute_sell_order(sell_price, quantity_btc)
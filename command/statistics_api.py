@@ -7,6 +7,7 @@ from flask import jsonify, request
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List
 import sqlite3
+import traceback
 
 
 class StatisticsAPI:
@@ -140,7 +141,6 @@ class StatisticsAPI:
         except Exception as e:
             print(f"❌ Erreur récupération trades: {e}")
             print(f"   Fichier DB: {self.database.db_file}")
-            import traceback
             traceback.print_exc()
             return []
     
@@ -9,6 +9,7 @@ CORRECTIFS:
 
 import ccxt
 import time
+import traceback
 from hyperliquid.info import Info
 from hyperliquid.utils import constants
 from typing import Dict, Optional, Callable, Any, List
@@ -134,6 +135,10 @@ class CircuitBreaker:
         # Si on arrive ici, on a épuisé toutes les tentatives
         raise last_exception
     
+    def is_rejecting(self) -> bool:
+        """True si un appel serait refusé d'office (OPEN, délai de reprise non écoulé)"""
+        return self.state == 'open' and time.time() - self.last_failure_time <= self.timeout
+    
     def get_state(self) -> dict:
         """Retourne l'état actuel du circuit breaker"""
         return {
@@ -229,8 +234,9 @@ class TradingEngineImproved:
             base_url = constants.MAINNET_API_URL
         
         self.info = Info(base_url, skip_ws=True)
-        if hasattr(self.info, 'session') and self.info.session:
-            self.info.session.timeout = self.SDK_TIMEOUT
+        # Le SDK applique info.timeout à chaque requête
+        # (requests.Session n'a pas d'attribut timeout)
+        self.info.timeout = self.SDK_TIMEOUT
         
         self.account_address = config.wallet_address
         
@@ -247,15 +253,19 @@ class TradingEngineImproved:
             }
         })
         
-        # ⚡ Configurer la session avec keep-alive et pool de connexions
+        # ⚡ Configurer les sessions (CCXT et SDK) avec keep-alive et pool de connexions
+        # partagé entre les threads achat/vente/synchronisation
+        import requests
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=5,  # ✅ Augmenté de 1 à 5
+            pool_maxsize=16,  # ✅ Un slot par thread appelant, avec marge
+            max_retries=0,  # On gère les retries nous-mêmes
+            pool_block=False
+        )
+        if getattr(self.info, 'session', None):
+            self.info.session.mount('http://', adapter)
+            self.info.session.mount('https://', adapter)
         if hasattr(self.exchange, 'session'):
-            import requests
-            adapter = requests.adapters.HTTPAdapter(
-                pool_connections=5,  # ✅ Augmenté de 1 à 5
-                pool_maxsize=10,  # ✅ Augmenté de 1 à 10
-                max_retries=0,  # On gère les retries nous-mêmes
-                pool_block=False
-            )
             self.exchange.session.mount('http://', adapter)
             self.exchange.session.mount('https://', adapter)
             self.exchange.session.keep_alive = True
@@ -280,13 +290,20 @@ class TradingEngineImproved:
         print(f"   CCXT symbol: {self.ccxt_spot_symbol}")
         print(f"=" * 60)
     
+    def on_config_reload(self, config: TradingConfig):
+        """Applique une configuration rechargée
+        
+        Wallet, clé et symbole restent ceux de la connexion établie à l'init.
+        """
+        self.config = config
+    
     def _wait_for_rate_limit(self):
         """Attend le délai minimum entre les requêtes pour éviter le rate limiting"""
-        elapsed = time.time() - self.last_request_time
+        elapsed = time.monotonic() - self.last_request_time
         if elapsed < self.REQUEST_DELAY:
             wait_time = self.REQUEST_DELAY - elapsed
             time.sleep(wait_time)
-        self.last_request_time = time.time()
+        self.last_request_time = time.monotonic()
     
     def get_balance(self, asset: str = "USDC", available_only: bool = False) -> float:
         """Récupère le solde d'un actif SPOT via SDK"""
@@ -549,13 +566,19 @@ class TradingEngineImproved:
         except Exception as e:
             error_msg = str(e)
             print(f"\n❌ ERREUR PLACEMENT ORDRE: {error_msg}")
-            import traceback
             traceback.print_exc()
             return None
     
-    def calculate_order_size(self, price: float, percent: float) -> float:
-        """Calcule la taille de l'ordre"""
-        balance_details = self.get_balance_details("USDC")
+    def calculate_order_size(self, price: float, percent: float,
+                             balance_details: Optional[dict] = None) -> float:
+        """Calcule la taille de l'ordre
+        
+        Args:
+            balance_details: Solde USDC déjà récupéré (get_balance_details),
+                             évite un second appel API
+        """
+        if balance_details is None:
+            balance_details = self.get_balance_details("USDC")
         usdc_available = balance_details['available']
         
         if usdc_available <= 0:
@@ -14,6 +14,7 @@ from config import TradingConfig
 from DB.database import Database
 from command.statistics_api import StatisticsAPI  # 👈 NOUVEAU
 import threading
+import traceback
 import os
 import json
 
@@ -139,8 +140,7 @@ class WebInterface:
         
         # 4. Paires actives avec gestion d'erreur
         try:
-            pairs = self.database.get_active_order_pairs()
-            data['active_pairs'] = len(pairs) if pairs else 0
+            data['active_pairs'] = sum(1 for _ in self.database.iter_active_order_pairs())
         except Exception as e:
             print(f"⚠️  Erreur récupération paires actives: {e}")
             error_count += 1
@@ -184,7 +184,7 @@ class WebInterface:
                 
                 try:
                     if self.bot_controller and hasattr(self.bot_controller, 'market_analyzer'):
-                        analysis = self.bot_controller.market_analyzer.analyze_market()
+                        analysis = self.bot_controller.market_analyzer.analyze_market_cached()
                         market_type = analysis.get('market_type', 'UNKNOWN')
                         market_trend = analysis.get('trend', 'UNKNOWN')
                         btc_price_raw = analysis.get('current_price', 0)
@@ -232,7 +232,6 @@ class WebInterface:
                 )
             except Exception as e:
                 print(f"❌ Erreur page index: {e}")
-                import traceback
                 traceback.print_exc()
                 return self.error_response(f"Erreur page paires: {e}")
             
@@ -244,7 +243,6 @@ class WebInterface:
                 return render_template('statistics.html')
             except Exception as e:
                 print(f"❌ Erreur affichage page statistiques: {e}")
-                import traceback
                 traceback.print_exc()
                 return self.error_response(
                     f"Impossible d'afficher la page des statistiques: {str(e)}",
@@ -311,7 +309,7 @@ class WebInterface:
                         'error': 'Market analyzer non disponible'
                     }), 503
                 
-                analysis = self.bot_controller.market_analyzer.analyze_market()
+                analysis = self.bot_controller.market_analyzer.analyze_market_cached()
                 
                 return jsonify({
                     'success': True,
@@ -397,7 +395,6 @@ class WebInterface:
                 return jsonify(stats)
             except Exception as e:
                 print(f"❌ Erreur API statistiques: {e}")
-                import traceback
                 traceback.print_exc()
                 return jsonify({
                     'success': False,
@@ -504,7 +501,6 @@ class WebInterface:
             except Exception as e:
                 flash(f'❌ Erreur démarrage: {str(e)}', 'error')
                 print(f"❌ Erreur control_start: {e}")
-                import traceback
                 traceback.print_exc()
             
             return redirect(url_for('all_pairs'))
@@ -524,7 +520,6 @@ class WebInterface:
             except Exception as e:
                 flash(f'❌ Erreur arrêt: {str(e)}', 'error')
                 print(f"❌ Erreur control_stop: {e}")
-                import traceback
                 traceback.print_exc()
             
             return redirect(url_for('all_pairs'))
@@ -622,7 +617,6 @@ class WebInterface:
             except Exception as e:
                 error_msg = f'❌ Erreur rechargement: {str(e)}'
                 print(f"❌ Erreur control_reload_config: {e}")
-                import traceback
                 traceback.print_exc()
                 
                 if request.path.startswith('/api/'):
@@ -660,7 +654,6 @@ class WebInterface:
             except Exception as e:
                 flash(f'❌ Erreur annulation: {str(e)}', 'error')
                 print(f"❌ Erreur control_cancel_order: {e}")
-                import traceback
                 traceback.print_exc()
             
             return redirect(url_for('all_pairs'))
@@ -690,7 +683,6 @@ class WebInterface:
             except Exception as e:
                 flash(f'❌ Erreur annulation massive: {str(e)}', 'error')
                 print(f"❌ Erreur control_cancel_all_orders: {e}")
-                import traceback
                 traceback.print_exc()
             
             return redirect(url_for('all_pairs'))
@@ -707,7 +699,6 @@ class WebInterface:
             except Exception as e:
                 flash(f'❌ Erreur synchronisation: {str(e)}', 'error')
                 print(f"❌ Erreur control_sync: {e}")
-                import traceback
                 traceback.print_exc()
             
             return redirect(url_for('all_pairs'))
@@ -852,6 +843,5 @@ class WebInterface:
             
         except Exception as e:
             print(f"❌ Erreur lancement interface web: {e}")
-            import traceback
             traceback.print_exc()
             raise
@@ -139,9 +139,22 @@ class TradingConfig:
         self.bot_directory = self._get_env('BOT_DIRECTORY', '.')
         self.log_file = self._get_env('LOG_FILE', 'log/trading.log')
         
+        # Signature du fichier chargé (reload() l'ignore s'il n'a pas changé)
+        self._env_signature = self._read_env_signature(env_file)
+        self.last_reload_changed = False
+        
         # Afficher le résumé de la configuration
         self._print_summary()
     
+    @staticmethod
+    def _read_env_signature(env_file: str) -> Optional[tuple]:
+        """Signature (chemin, mtime, taille) du fichier .env, None s'il est illisible"""
+        try:
+            st = os.stat(env_file)
+        except OSError:
+            return None
+        return (os.path.abspath(env_file), st.st_mtime_ns, st.st_size)
+    
     def _get_env(self, key: str, default: str = '') -> str:
         """Récupère une variable d'environnement string"""
         value = os.getenv(key, default)
@@ -248,13 +261,25 @@ class TradingConfig:
         
         print(f"\n{'='*60}")
     
-    def reload(self) -> bool:
+    def reload(self, force: bool = False) -> bool:
         """Recharge la configuration depuis le fichier .env
         
+        Le fichier n'est pas relu si sa signature (mtime, taille) est inchangée
+        depuis le dernier chargement; last_reload_changed indique alors False.
+        
+        Args:
+            force: Relire le fichier même s'il n'a pas changé
+        
         Returns:
             bool: True si le rechargement a réussi, False sinon
         """
         try:
+            env_signature = self._read_env_signature(self.config_file)
+            if not force and env_signature is not None and env_signature == self._env_signature:
+                print(f"ℹ️  {self.config_file} inchangé depuis le dernier chargement")
+                self.last_reload_changed = False
+                return True
+            
             print(f"\n{'='*60}")
             print(f"🔄 RECHARGEMENT DE LA CONFIGURATION")
             print(f"{'='*60}")
@@ -395,6 +420,8 @@ class TradingConfig:
             print(f"✅ Configuration rechargée avec succès")
             print(f"{'='*60}\n")
             
+            self._env_signature = env_signature
+            self.last_reload_changed = True
             return True
             
         except Exception as e:
@@ -20,6 +20,7 @@ from command.web_interface import WebInterface
 # Variables globales
 bot_instance = None
 web_instance = None
+database_instance = None
 shutdown_event = threading.Event()
 
 
@@ -37,6 +38,11 @@ def signal_handler(sig, frame):
         print("🌐 Arrêt de l'interface web...")
         # Flask s'arrête automatiquement
     
+    # Fermer explicitement les connexions SQLite (checkpoint WAL)
+    for db in (database_instance, getattr(bot_instance, 'database', None)):
+        if db:
+            db.close()
+    
     print("✅ Bot arrêté proprement\n")
     sys.exit(0)
 
@@ -53,7 +59,7 @@ def print_banner():
 
 def main():
     """Fonction principale"""
-    global bot_instance, web_instance
+    global bot_instance, web_instance, database_instance
     
     # Enregistrer le gestionnaire de signaux
     signal.signal(signal.SIGINT, signal_handler)
@@ -70,7 +76,7 @@ def main():
         
         # 2. Initialiser la base de données
         print("🗄️  Initialisation de la base de données...")
-        database = Database(config)
+        database = database_instance = Database(config)
         print("✅ Base de données initialisée\n")
         
         # 3. Initialiser le contrôleur du bot
@@ -3,6 +3,8 @@ Module de notifications Telegram pour le bot de trading
 Envoie des alertes en temps reel sur vos trades
 """
 
+import queue
+import threading
 import requests
 from datetime import datetime
 from typing import Optional
@@ -10,6 +12,8 @@ from typing import Optional
 class TelegramNotifier:
     """Gestion des notifications Telegram"""
     
+    QUEUE_MAXSIZE = 256  # Messages en attente d'envoi (au-delà: message abandonné)
+    
     def __init__(self, bot_token: str, chat_id: str, enabled: bool = True):
         """
         Initialise le notifier Telegram
@@ -24,13 +28,25 @@ class TelegramNotifier:
         self.enabled = enabled
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
         
+        # Envoi asynchrone: les appelants (threads de trading, web) mettent le
+        # message en file et n'attendent pas l'aller-retour HTTPS vers Telegram
+        self._queue = queue.Queue(maxsize=self.QUEUE_MAXSIZE)
+        self._session = requests.Session()
+        self._worker = None
+        
         if self.enabled:
             self._test_connection()
+        
+        if self.enabled:
+            self._worker = threading.Thread(
+                target=self._send_worker, daemon=True, name="TelegramSender"
+            )
+            self._worker.start()
     
     def _test_connection(self):
         """Test la connexion avec Telegram"""
         try:
-            response = requests.get(f"{self.base_url}/getMe", timeout=5)
+            response = self._session.get(f"{self.base_url}/getMe", timeout=5)
             if response.status_code == 200:
                 bot_info = response.json()
                 print(f"✅ Telegram connecte: @{bot_info['result']['username']}")
@@ -42,10 +58,53 @@ class TelegramNotifier:
             self.enabled = False
     
     def _send_message(self, message: str, parse_mode: str = "Markdown"):
-        """Envoie un message Telegram"""
+        """Met un message Telegram en file d'envoi (non bloquant)
+        
+        Returns:
+            bool: False si désactivé ou si la file est pleine (message abandonné)
+        """
         if not self.enabled:
             return False
         
+        try:
+            self._queue.put_nowait((message, parse_mode))
+            return True
+        except queue.Full:
+            print("⚠️  File Telegram pleine - message abandonné")
+            return False
+    
+    def send_message(self, message: str, parse_mode: str = "Markdown"):
+        """Envoie un message libre (non bloquant)"""
+        return self._send_message(message, parse_mode)
+    
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Attend l'envoi des messages déjà en file (ex: avant l'arrêt du process)
+        
+        Returns:
+            bool: True si la file a été vidée avant le timeout
+        """
+        if not self._worker or not self._worker.is_alive():
+            return True
+        
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+    
+    def _send_worker(self):
+        """Thread d'envoi: vide la file dans l'ordre d'arrivée"""
+        while True:
+            item = self._queue.get()
+            if isinstance(item, threading.Event):
+                # Marqueur de flush(): tout ce qui précède est envoyé
+                item.set()
+                continue
+            self._post_message(*item)
+    
+    def _post_message(self, message: str, parse_mode: str) -> bool:
+        """Envoie un message Telegram (appel HTTP, thread d'envoi)"""
         try:
             url = f"{self.base_url}/sendMessage"
             payload = {
@@ -55,7 +114,7 @@ class TelegramNotifier:
                 "disable_web_page_preview": True
             }
             
-            response = requests.post(url, json=payload, timeout=10)
+            response = self._session.post(url, json=payload, timeout=10)
             return response.status_code == 200
             
         except Exception as e: